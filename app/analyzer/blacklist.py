@@ -1,8 +1,73 @@
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Set, Optional
+from typing import Set, Optional, Dict, Any, Tuple, Iterator, Iterable
+from sortedcontainers import SortedSet
+from app.analyzer.domain_trie import DomainTrie
 from app.utils.logger import log
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson 미설치 시 대용량 파일도 일괄 파싱
+    ijson = None
+
+
+def _json_loads(raw: bytes) -> Any:
+    """JSON 바이트 파싱 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def _json_dumps(data: Any) -> bytes:
+    """JSON 직렬화 (들여쓰기 2칸, UTF-8)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _normalize_domain(domain: str) -> str:
+    """도메인 정규화 (앞뒤 공백 제거 + 소문자), 저장 시 한 번만 수행"""
+    return domain.strip().lower()
+
+
+def _normalized_entries(domains: Iterable[str]) -> Iterator[str]:
+    """저장용 도메인 목록 정규화 (빈 항목 제외)"""
+    for domain in domains:
+        domain = _normalize_domain(domain)
+        if domain:
+            yield domain
+
+
+def _stream_blacklist(path: Path) -> Tuple[SortedSet, str]:
+    """
+    대용량 블랙리스트 스트리밍 파싱 (ijson)
+
+    전체 JSON 구조를 메모리에 올리지 않고 도메인을 읽는 즉시 집합에 추가합니다.
+
+    Returns:
+        Tuple[SortedSet, str]: (소문자 도메인 집합, 설명)
+    """
+    description = ''
+
+    def iter_domains(f):
+        nonlocal description
+        for prefix, event, value in ijson.parse(f):
+            if prefix == 'domains.item' and event == 'string':
+                yield value
+            elif prefix == 'description' and event == 'string':
+                description = value
+
+    domains = SortedSet()
+    with open(path, 'rb') as f:
+        domains.update(_normalized_entries(iter_domains(f)))
+    return domains, description
+
 
 class BlacklistManager:
     """
@@ -10,39 +75,129 @@ class BlacklistManager:
 
     JSON 파일 기반으로 알려진 피싱 도메인 블랙리스트를 관리합니다.
     - 블랙리스트 로드 및 저장
-    - 도메인 조회
+    - 도메인 조회 (서브도메인 포함, 역순 라벨 트라이 사용)
     - 도메인 추가/제거
+
+    예: 'phishing.com'이 등재되어 있으면 'login.phishing.com'도 차단 대상입니다.
     """
 
+    # 파일별 파싱 결과 캐시 (인스턴스 간 공유): {경로: ((mtime_ns, size), 도메인 집합, 트라이, 설명)}
+    # 파일이 바뀌지 않았으면 다시 읽거나 트라이를 다시 만들지 않으며,
+    # 공유된 집합과 트라이는 수정 전에 복사합니다.
+    _cache: Dict[Path, Tuple[Tuple[int, int], SortedSet, DomainTrie, str]] = {}
+
+    # 캐시된 집합을 다른 인스턴스가 가져간 경로 (등록한 인스턴스도 수정 전에 복사해야 함)
+    _shared_keys: Set[Path] = set()
+
+    # 이 크기 이상의 파일은 ijson으로 스트리밍 파싱 (설치된 경우)
+    STREAMING_THRESHOLD_BYTES = 8 * 1024 * 1024
+
     def __init__(self, blacklist_file: str = "data/blacklist.json"):
         """
         Args:
             blacklist_file: 블랙리스트 JSON 파일 경로
         """
         self.blacklist_file = Path(blacklist_file)
-        self.blacklist: Set[str] = set()
+        self.blacklist: SortedSet = SortedSet()  # 정렬 상태 유지 (저장 시 재정렬 불필요)
         self.description: str = ""
+        self._trie = DomainTrie()
+        self._owns_blacklist = True
+        self._suspend_save = False
+        self._dirty = False
         self._load_blacklist()
 
     def _load_blacklist(self):
         """블랙리스트 파일 로드"""
         if not self.blacklist_file.exists():
-            log.warning(f"블랙리스트 파일 없음: {self.blacklist_file}")
+            log.warning("블랙리스트 파일 없음: {}", self.blacklist_file)
             self._create_default_blacklist()
             return
 
         try:
-            with open(self.blacklist_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.blacklist = set(domain.lower() for domain in data.get('domains', []))
+            key = self._cache_key()
+            cached = BlacklistManager._cache.get(key)
+            if cached and cached[0] == self._file_signature():
+                _, blacklist, trie, self.description = cached
+                if blacklist is not self.blacklist:
+                    self.blacklist, self._trie = blacklist, trie
+                    self._owns_blacklist = False
+                    BlacklistManager._shared_keys.add(key)
+                log.debug("블랙리스트 캐시 사용: {}개 도메인", len(self.blacklist))
+                return
+
+            if ijson is not None and self._is_large_file():
+                self.blacklist, self.description = _stream_blacklist(self.blacklist_file)
+            else:
+                data = _json_loads(self.blacklist_file.read_bytes())
+                self.blacklist = SortedSet(_normalized_entries(data.get('domains', [])))
                 self.description = data.get('description', '')
-                log.info(f"블랙리스트 로드 완료: {len(self.blacklist)}개 도메인")
+                log.info("블랙리스트 로드 완료: {}개 도메인", len(self.blacklist))
+            self._owns_blacklist = True
+            self._rebuild_index()
+            self._update_cache()
         except json.JSONDecodeError as e:
-            log.error(f"블랙리스트 JSON 파싱 실패: {e}")
-            self.blacklist = set()
+            log.error("블랙리스트 JSON 파싱 실패: {}", e)
+            self._reset_blacklist()
         except Exception as e:
-            log.error(f"블랙리스트 로드 실패: {e}")
-            self.blacklist = set()
+            log.error("블랙리스트 로드 실패: {}", e)
+            self._reset_blacklist()
+
+    def _reset_blacklist(self):
+        """빈 블랙리스트로 초기화 (로드 실패 시)"""
+        self.blacklist = SortedSet()
+        self._trie = DomainTrie()
+        self._owns_blacklist = True
+
+    def _cache_key(self) -> Path:
+        """캐시 키 (절대 경로)"""
+        return self.blacklist_file.resolve()
+
+    def _file_signature(self) -> Tuple[int, int]:
+        """파일 변경 감지용 시그니처 (수정 시각, 크기)"""
+        stat = self.blacklist_file.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _is_large_file(self) -> bool:
+        """스트리밍 파싱 대상 크기인지 확인"""
+        return self._file_signature()[1] >= self.STREAMING_THRESHOLD_BYTES
+
+    def _update_cache(self):
+        """
+        현재 블랙리스트를 클래스 캐시에 등록
+
+        소유권은 유지하므로, 다른 인스턴스가 가져가기 전까지는 복사 없이 수정합니다.
+        """
+        key = self._cache_key()
+        BlacklistManager._cache[key] = (
+            self._file_signature(), self.blacklist, self._trie, self.description
+        )
+        BlacklistManager._shared_keys.discard(key)
+
+    def _ensure_own_blacklist(self):
+        """
+        집합과 트라이를 수정하기 전 준비 (copy-on-write)
+
+        - 다른 인스턴스의 집합을 빌려 쓰는 중이면 복사 (트라이는 복사한 집합으로 재구성)
+        - 직접 등록한 캐시 집합을 다른 인스턴스가 가져갔으면 복사
+        - 아무도 가져가지 않았으면 캐시 항목만 비움 (저장 전 변경이 노출되지 않도록)
+        """
+        if self._owns_blacklist:
+            key = self._cache_key()
+            cached = BlacklistManager._cache.get(key)
+            if cached is None or cached[1] is not self.blacklist:
+                return
+            if key not in BlacklistManager._shared_keys:
+                del BlacklistManager._cache[key]
+                return
+        self.blacklist = SortedSet(self.blacklist)
+        self._rebuild_index()
+        self._owns_blacklist = True
+
+    def _rebuild_index(self):
+        """블랙리스트 집합으로부터 역순 라벨 트라이 재구성"""
+        self._trie = DomainTrie()
+        for domain in self.blacklist:
+            self._trie.insert(domain)
 
     def _create_default_blacklist(self):
         """기본 블랙리스트 생성"""
@@ -58,27 +213,42 @@ class BlacklistManager:
         }
 
         try:
-            with open(self.blacklist_file, 'w', encoding='utf-8') as f:
-                json.dump(default_data, f, indent=2, ensure_ascii=False)
-            self.blacklist = set(domain.lower() for domain in default_data['domains'])
+            self.blacklist_file.write_bytes(_json_dumps(default_data))
+            self.blacklist = SortedSet(_normalized_entries(default_data['domains']))
             self.description = default_data['description']
-            log.info(f"기본 블랙리스트 생성 완료: {self.blacklist_file}")
+            self._owns_blacklist = True
+            self._rebuild_index()
+            self._update_cache()
+            log.info("기본 블랙리스트 생성 완료: {}", self.blacklist_file)
         except Exception as e:
-            log.error(f"기본 블랙리스트 생성 실패: {e}")
+            log.error("기본 블랙리스트 생성 실패: {}", e)
+            self._reset_blacklist()
 
-    def is_blacklisted(self, domain: str) -> bool:
+    def is_blacklisted(self, domain: str, assume_lowercase: bool = False) -> bool:
         """
         도메인이 블랙리스트에 있는지 확인
 
+        등재된 도메인 자신 또는 그 서브도메인이면 True를 반환합니다.
+
         Args:
-            domain: 확인할 도메인
+            domain: 확인할 도메인 (호스트명)
+            assume_lowercase: 이미 소문자로 정규화된 경우 True (소문자 변환 생략)
 
         Returns:
             bool: 블랙리스트 포함 여부
         """
         if not domain:
             return False
-        return domain.lower() in self.blacklist
+
+        if not assume_lowercase:
+            domain = domain.lower()
+
+        # 등재 도메인과 정확히 일치하면 해시 조회 한 번으로 종료
+        if domain in self.blacklist:
+            return True
+
+        # 미등재 도메인은 대개 최상위 한두 라벨에서 트라이 탐색이 끝남
+        return self._trie.contains_suffix(domain.split('.'))
 
     def add(self, domain: str) -> bool:
         """
@@ -90,17 +260,22 @@ class BlacklistManager:
         Returns:
             bool: 추가 성공 여부
         """
+        domain = _normalize_domain(domain or '')
         if not domain:
             return False
 
-        domain = domain.lower()
-        if domain in self.blacklist:
-            log.warning(f"이미 블랙리스트에 존재: {domain}")
-            return False
+        self._ensure_own_blacklist()
 
+        # 포함 여부 확인과 추가를 한 번에 (크기가 그대로면 이미 존재)
+        count = len(self.blacklist)
         self.blacklist.add(domain)
-        self._save_blacklist()
-        log.info(f"블랙리스트에 추가: {domain}")
+        if len(self.blacklist) == count:
+            log.warning("이미 블랙리스트에 존재: {}", domain)
+            return False
+
+        self._trie.insert(domain)
+        self._request_save()
+        log.info("블랙리스트에 추가: {}", domain)
         return True
 
     def remove(self, domain: str) -> bool:
@@ -113,31 +288,62 @@ class BlacklistManager:
         Returns:
             bool: 제거 성공 여부
         """
+        domain = _normalize_domain(domain or '')
         if not domain:
             return False
 
-        domain = domain.lower()
-        if domain not in self.blacklist:
-            log.warning(f"블랙리스트에 없음: {domain}")
+        self._ensure_own_blacklist()
+        try:
+            self.blacklist.remove(domain)
+        except KeyError:
+            log.warning("블랙리스트에 없음: {}", domain)
             return False
 
-        self.blacklist.remove(domain)
-        self._save_blacklist()
-        log.info(f"블랙리스트에서 제거: {domain}")
+        self._trie.remove(domain)
+        self._request_save()
+        log.info("블랙리스트에서 제거: {}", domain)
         return True
 
+    @contextmanager
+    def bulk_update(self) -> Iterator["BlacklistManager"]:
+        """
+        대량 추가/제거용 컨텍스트 매니저
+
+        블록 안에서는 파일 저장을 미루고, 변경이 있었으면 종료 시 한 번만 저장합니다.
+
+        Example:
+            with manager.bulk_update():
+                for domain in feed:
+                    manager.add(domain)
+        """
+        self._suspend_save = True
+        try:
+            yield self
+        finally:
+            self._suspend_save = False
+            if self._dirty:
+                self._save_blacklist()
+
+    def _request_save(self):
+        """변경 사항 저장 (bulk_update 중이면 종료 시점까지 지연)"""
+        if self._suspend_save:
+            self._dirty = True
+            return
+        self._save_blacklist()
+
     def _save_blacklist(self):
         """블랙리스트 파일에 저장"""
+        self._dirty = False
         try:
             data = {
-                'domains': sorted(list(self.blacklist)),
+                'domains': list(self.blacklist),
                 'description': self.description or "Known phishing domains"
             }
-            with open(self.blacklist_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            log.debug(f"블랙리스트 저장 완료: {len(self.blacklist)}개 도메인")
+            self.blacklist_file.write_bytes(_json_dumps(data))
+            self._update_cache()
+            log.debug("블랙리스트 저장 완료: {}개 도메인", len(self.blacklist))
         except Exception as e:
-            log.error(f"블랙리스트 저장 실패: {e}")
+            log.error("블랙리스트 저장 실패: {}", e)
 
     def get_count(self) -> int:
         """블랙리스트 도메인 개수 반환"""
@@ -145,7 +351,7 @@ class BlacklistManager:
 
     def get_all(self) -> Set[str]:
         """블랙리스트 전체 목록 반환"""
-        return self.blacklist.copy()
+        return set(self.blacklist)
 
     def reload(self):
         """블랙리스트 다시 로드"""
@@ -1,7 +1,94 @@
+import ipaddress
 import re
-import validators
+from functools import lru_cache
+from types import MappingProxyType
 from urllib.parse import urlparse
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional
+from app.config import settings
+
+
+# URL 형식 검증 정규식: http(s)://호스트[:포트][/경로|?쿼리|#프래그먼트]
+# (모듈 import 시 한 번만 컴파일, '$'는 끝의 개행 앞에서도 일치하므로 \Z로 고정)
+_URL_RE = re.compile(
+    r'^https?://'
+    r'(?:\[[0-9a-fA-F:]+\]|[^\s/?#]+)'  # IPv6 리터럴 또는 호스트
+    r'(?::\d+)?'  # 포트
+    r'(?:[/?#][^\s]*)?\Z',  # 경로/쿼리/프래그먼트
+    re.IGNORECASE
+)
+
+# 의심스러운 URL 패턴 (단일 정규식으로 합쳐 한 번만 스캔)
+# - @: URL에 @ 포함 (피싱 사이트가 사용자 속이기용)
+# - -{2,}: 연속된 하이픈
+# - [a-z0-9]{30,}: 30자 이상의 긴 무작위 문자열
+_SUSPICIOUS_RE = re.compile(r'@|-{2,}|[a-z0-9]{30,}', re.IGNORECASE)
+
+
+def _is_valid_url(url: str) -> bool:
+    """URL 형식 유효성 확인"""
+    return _URL_RE.match(url) is not None
+
+
+def _parse_ipv4_number(part: str) -> Optional[int]:
+    """IPv4 구성 숫자 해석 (0x 접두사는 16진수, 0으로 시작하면 8진수, 나머지는 10진수)"""
+    try:
+        if part[:2] == '0x':
+            return int(part[2:] or '0', 16)
+        if len(part) > 1 and part[0] == '0':
+            return int(part[1:], 8)
+        return int(part, 10) if part.isdigit() else None
+    except ValueError:
+        return None
+
+
+def _is_obfuscated_ipv4(hostname: str) -> bool:
+    """
+    브라우저가 IPv4로 해석하는 비표준 표기인지 확인 (WHATWG URL 표준의 IPv4 파싱 규칙)
+
+    ipaddress가 거부하는 0 채움(192.168.001.001), 정수(2130706433), 16진수(0x7f.0.0.1)
+    표기를 IP 주소로 판단합니다. 범위를 벗어난 값(999.1.1.1)은 IP 주소가 아닙니다.
+    """
+    parts = hostname.split('.')
+    if parts[-1] == '' and len(parts) > 1:
+        parts.pop()  # 끝의 점 하나는 허용
+    if not 1 <= len(parts) <= 4:
+        return False
+
+    numbers = [_parse_ipv4_number(part) for part in parts]
+    if None in numbers or any(n > 255 for n in numbers[:-1]):
+        return False
+    # 마지막 숫자가 남은 바이트를 모두 채움 (예: 192.168.257 → 192.168.1.1)
+    return numbers[-1] < 256 ** (5 - len(numbers))
+
+
+def _fast_hostname(url: str) -> Optional[str]:
+    """
+    검증된 URL에서 호스트명만 한 번에 추출 (urlparse 대신 str.find 사용)
+
+    urlparse(url).hostname과 같은 규칙(탭·개행 제거, userinfo·포트 제거, 소문자 변환)을
+    따르며, 대괄호가 포함된 호스트(IPv6 리터럴 등)는 None을 반환하여 urlparse로 처리하게 합니다.
+
+    Args:
+        url: _is_valid_url()을 통과한 URL
+
+    Returns:
+        Optional[str]: 소문자 호스트명 (판단할 수 없으면 None)
+    """
+    # urlsplit과 마찬가지로 URL 안의 탭/개행 문자는 무시
+    if '\t' in url or '\r' in url or '\n' in url:
+        url = url.replace('\t', '').replace('\r', '').replace('\n', '')
+
+    start = url.find('://') + 3
+    end = len(url)
+    for sep in '/?#':
+        index = url.find(sep, start, end)
+        if index != -1:
+            end = index
+
+    authority = url[start:end]
+    if '[' in authority or ']' in authority:
+        return None
+    return authority.rpartition('@')[2].partition(':')[0].lower()
 
 
 class DomainAnalyzer:
@@ -14,20 +101,17 @@ class DomainAnalyzer:
     - 의심스러운 URL 패턴 (@ 포함, 긴 무작위 문자열 등)
     - 서브도메인 깊이 분석
     - 도메인 및 TLD 추출
-    """
 
-    # 의심스러운 URL 패턴
-    SUSPICIOUS_PATTERNS = [
-        r'@',  # URL에 @ 포함 (피싱 사이트가 사용자 속이기용)
-        r'-{2,}',  # 연속된 하이픈
-        r'[a-z0-9]{30,}',  # 30자 이상의 긴 무작위 문자열
-    ]
+    상태가 없는 클래스이므로 인스턴스를 만들지 않고 정적 메서드로 호출합니다.
+    """
 
     @staticmethod
     def analyze(url: str) -> Dict[str, Any]:
         """
         URL 도메인 분석
 
+        같은 URL의 분석 결과는 캐시되며(max_cached_url_length 이하), 호출마다 새 dict를 반환합니다.
+
         Args:
             url: 분석할 URL
 
@@ -37,10 +121,29 @@ class DomainAnalyzer:
                 - is_ip_address: IP 주소 직접 사용 여부
                 - has_suspicious_pattern: 의심스러운 패턴 존재 여부
                 - subdomain_depth: 서브도메인 깊이
-                - domain: 도메인 (예: example.com)
+                - domain: 도메인 (예: example.com, 소문자)
                 - tld: 최상위 도메인 (예: com)
-                - hostname: 전체 호스트명
+                - hostname: 전체 호스트명 (소문자)
         """
+        if len(url) > settings.max_cached_url_length:
+            return DomainAnalyzer._analyze(url)
+        return dict(_analyze_cached(url))
+
+    @staticmethod
+    def analyze_readonly(url: str) -> Mapping[str, Any]:
+        """
+        URL 도메인 분석 (읽기 전용 뷰)
+
+        analyze()와 같은 결과를 복사 없이 캐시된 읽기 전용 매핑으로 반환합니다.
+        결과를 수정하지 않는 호출부(요청 처리 경로)에서 사용합니다.
+        """
+        if len(url) > settings.max_cached_url_length:
+            return MappingProxyType(DomainAnalyzer._analyze(url))
+        return _analyze_cached(url)
+
+    @staticmethod
+    def _analyze(url: str) -> Dict[str, Any]:
+        """URL 도메인 분석 (캐시 없이 실제 분석 수행)"""
         result = {
             'is_valid_url': False,
             'is_ip_address': False,
@@ -52,14 +155,16 @@ class DomainAnalyzer:
         }
 
         # URL 유효성 검증
-        if not validators.url(url):
+        if not _is_valid_url(url):
             return result
 
         result['is_valid_url'] = True
 
         try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname or ''
+            # 호스트명은 대소문자를 구분하지 않으므로 소문자로 정규화 (RFC 3986)
+            hostname = _fast_hostname(url)
+            if hostname is None:
+                hostname = (urlparse(url).hostname or '').lower()
             result['hostname'] = hostname
 
             # IP 주소 직접 사용 확인
@@ -71,8 +176,8 @@ class DomainAnalyzer:
             # 의심스러운 패턴 확인
             result['has_suspicious_pattern'] = DomainAnalyzer._has_suspicious_pattern(url)
 
-            # 도메인 추출
-            parts = hostname.split('.')
+            # 도메인 추출 (마지막 두 라벨만 필요하므로 최대 2번만 분리)
+            parts = hostname.rsplit('.', 2)
             if len(parts) >= 2:
                 result['domain'] = '.'.join(parts[-2:])
                 result['tld'] = parts[-1]
@@ -86,29 +191,29 @@ class DomainAnalyzer:
     @staticmethod
     def _is_ip_address(hostname: str) -> bool:
         """
-        IP 주소인지 확인
+        IP 주소인지 확인 (IPv4, IPv6 모두 지원)
+
+        IP를 숨기려는 0 채움·정수·16진수 IPv4 표기도 IP 주소로 판단합니다.
 
         Args:
-            hostname: 호스트명
+            hostname: 호스트명 (소문자)
 
         Returns:
             bool: IP 주소 여부
         """
-        # IPv4 패턴 (간단한 검사)
-        ipv4_pattern = r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$'
-        if re.match(ipv4_pattern, hostname):
-            # 각 옥텟이 0-255 범위인지 확인
-            try:
-                parts = [int(p) for p in hostname.split('.')]
-                return all(0 <= p <= 255 for p in parts)
-            except ValueError:
-                return False
-
-        # IPv6 패턴 (간단한 검사)
-        if ':' in hostname and not hostname.startswith('['):
-            return True
+        hostname = hostname.strip('[]')
 
-        return False
+        # IPv4는 숫자와 점(16진수 표기는 0x), IPv6는 콜론을 반드시 포함하므로
+        # 일반 도메인은 예외를 두 번 발생시키는 ipaddress 파싱 없이 바로 제외
+        is_ipv4_like = hostname.replace('.', '').isdigit() or '0x' in hostname
+        if ':' not in hostname and not is_ipv4_like:
+            return False
+
+        try:
+            ipaddress.ip_address(hostname)
+            return True
+        except ValueError:
+            return is_ipv4_like and _is_obfuscated_ipv4(hostname)
 
     @staticmethod
     def _has_suspicious_pattern(url: str) -> bool:
@@ -121,10 +226,7 @@ class DomainAnalyzer:
         Returns:
             bool: 의심스러운 패턴 존재 여부
         """
-        return any(
-            re.search(pattern, url, re.IGNORECASE)
-            for pattern in DomainAnalyzer.SUSPICIOUS_PATTERNS
-        )
+        return _SUSPICIOUS_RE.search(url) is not None
 
     @staticmethod
     def extract_domain(url: str) -> str:
@@ -140,9 +242,15 @@ class DomainAnalyzer:
         try:
             parsed = urlparse(url)
             hostname = parsed.hostname or ''
-            parts = hostname.split('.')
+            parts = hostname.rsplit('.', 2)
             if len(parts) >= 2:
                 return '.'.join(parts[-2:])
             return hostname
         except Exception:
             return ''
+
+
+@lru_cache(maxsize=8192)
+def _analyze_cached(url: str) -> Mapping[str, Any]:
+    """URL별 분석 결과 캐시 (공유되므로 읽기 전용 매핑으로 보관)"""
+    return MappingProxyType(DomainAnalyzer._analyze(url))
@@ -0,0 +1,77 @@
+import sys
+from typing import Any, Dict, Sequence
+
+
+# 노드에서 등재 도메인의 끝을 표시하는 키 (라벨은 항상 문자열이므로 충돌 없음)
+_END = None
+
+
+class DomainTrie:
+    """
+    역순 라벨 트라이
+
+    도메인을 라벨 단위로 뒤집어 저장하여 "등재 도메인 자신 또는 그 서브도메인" 여부를
+    라벨 개수만큼의 dict 조회로 판단합니다.
+    - 'login.phishing.com' → com → phishing → login 순서로 저장
+    - 라벨 경계 단위로만 일치 ('le.com'은 'google.com'과 일치하지 않음)
+    """
+
+    __slots__ = ('_root',)
+
+    def __init__(self):
+        self._root: Dict[Any, Any] = {}
+
+    def insert(self, domain: str):
+        """
+        도메인 삽입 (소문자로 정규화된 도메인 기준)
+
+        라벨은 intern하여 'com' 같은 공통 라벨이 하나의 문자열 객체를 공유합니다.
+        """
+        node = self._root
+        for label in reversed(domain.split('.')):
+            node = node.setdefault(sys.intern(label), {})
+        node[_END] = True
+
+    def remove(self, domain: str) -> bool:
+        """
+        도메인 삭제 (하위에 다른 등재 도메인이 없는 노드는 함께 정리)
+
+        Returns:
+            bool: 삭제 여부 (등재되지 않은 도메인이면 False)
+        """
+        path = []
+        node = self._root
+        for label in reversed(domain.split('.')):
+            child = node.get(label)
+            if child is None:
+                return False
+            path.append((node, label))
+            node = child
+        if node.pop(_END, None) is None:
+            return False
+
+        # 비어 버린 노드를 잎에서부터 제거
+        for parent, label in reversed(path):
+            if parent[label]:
+                break
+            del parent[label]
+        return True
+
+    def contains_suffix(self, labels: Sequence[str]) -> bool:
+        """
+        라벨 목록이 등재된 도메인 자신 또는 그 서브도메인인지 확인
+
+        Args:
+            labels: '.'으로 분리한 호스트명 라벨 (예: ['login', 'phishing', 'com'])
+
+        Returns:
+            bool: 등재 도메인 접미사 존재 여부
+        """
+        node = self._root
+        for label in reversed(labels):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _END in node:
+                return True
+        return False
@@ -1,5 +1,7 @@
 import asyncio
-from typing import List, Tuple
+from operator import itemgetter
+from typing import List, Tuple, Optional
+import httpx
 from app.config import settings
 from app.analyzer.external_api.base_api import ExternalAPIBase
 from app.analyzer.external_api.google_safe_browsing import GoogleSafeBrowsingAPI
@@ -8,6 +10,17 @@ from app.analyzer.external_api.phishtank import PhishTankAPI
 from app.models.analysis_result import ExternalAPIResult, RiskLevel
 from app.utils.logger import log
 
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원에 필요)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+# 공유 커넥션 풀 크기 (일괄 분석 시 여러 URL의 조회가 동시에 진행됨)
+_MAX_CONNECTIONS = 100
+_MAX_KEEPALIVE_CONNECTIONS = 50
+
 
 class ExternalAPIManager:
     """
@@ -16,16 +29,37 @@ class ExternalAPIManager:
     설정된 외부 API들을 관리하고 다중 API에 병렬로 요청합니다.
     주요 기능:
     - 설정에 따라 API 자동 초기화
-    - 모든 API에 병렬 요청 (asyncio.gather)
+    - 모든 API에 병렬 요청 (HIGH 위험도가 나오면 나머지 요청 취소)
     - 가장 높은 위험도 선택
     - 각 API 결과 로깅
+    - 모든 API가 하나의 HTTP 클라이언트(커넥션 풀)를 공유
     """
 
     def __init__(self):
         """설정 파일을 기반으로 외부 API 초기화"""
         self.apis: List[ExternalAPIBase] = []
+        self._client: Optional[httpx.AsyncClient] = None
         self._initialize_apis()
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """공유 HTTP 클라이언트 반환 (최초 호출 시 생성)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                timeout=settings.analysis_timeout_seconds,
+                limits=httpx.Limits(
+                    max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=_MAX_CONNECTIONS
+                )
+            )
+        return self._client
+
+    def _bind_client(self):
+        """aclose() 이후 새 공유 클라이언트를 만들어 모든 API에 다시 연결"""
+        client = self._get_client()
+        for api in self.apis:
+            api.client = client
+
     def _initialize_apis(self):
         """설정된 외부 API만 초기화"""
         if not settings.enable_external_api:
@@ -36,7 +70,8 @@ class ExternalAPIManager:
         if settings.use_google_safe_browsing and settings.google_safe_browsing_api_key:
             self.apis.append(GoogleSafeBrowsingAPI(
                 api_key=settings.google_safe_browsing_api_key,
-                timeout=settings.analysis_timeout_seconds
+                timeout=settings.analysis_timeout_seconds,
+                client=self._get_client()
             ))
             log.info("✓ Google Safe Browsing API 활성화")
 
@@ -44,7 +79,8 @@ class ExternalAPIManager:
         if settings.use_virustotal and settings.virustotal_api_key:
             self.apis.append(VirusTotalAPI(
                 api_key=settings.virustotal_api_key,
-                timeout=settings.analysis_timeout_seconds
+                timeout=settings.analysis_timeout_seconds,
+                client=self._get_client()
             ))
             log.info("✓ VirusTotal API 활성화")
 
@@ -52,49 +88,82 @@ class ExternalAPIManager:
         if settings.use_phishtank:
             self.apis.append(PhishTankAPI(
                 api_key="",  # PhishTank는 API 키 선택사항
-                timeout=settings.analysis_timeout_seconds
+                timeout=settings.analysis_timeout_seconds,
+                client=self._get_client()
             ))
             log.info("✓ PhishTank API 활성화")
 
         if not self.apis:
             log.info("외부 API 미설정 (내부 분석만 사용)")
         else:
-            log.info(f"총 {len(self.apis)}개 외부 API 활성화 완료")
+            log.info("총 {}개 외부 API 활성화 완료", len(self.apis))
 
     async def check_url_all(self, url: str) -> List[ExternalAPIResult]:
         """
         선택된 모든 외부 API에 병렬로 요청
 
+        최종 위험도는 가장 높은 값만 필요하므로, 어느 API든 HIGH를 반환하면
+        아직 응답하지 않은 API 요청은 취소하고 바로 반환합니다.
+        결과는 응답 순서와 관계없이 self.apis 순서로 정렬되어, 동률일 때 결정 API와
+        판단 근거 순서가 네트워크 타이밍에 좌우되지 않습니다.
+
         Args:
             url: 검사할 URL
 
         Returns:
-            List[ExternalAPIResult]: 각 API의 분석 결과 리스트
+            List[ExternalAPIResult]: 응답한 API의 분석 결과 리스트 (self.apis 순서)
         """
         if not self.apis:
             return []
 
-        log.info(f"외부 API {len(self.apis)}개에 병렬 요청: {url}")
-
-        # 모든 API를 병렬로 호출 (asyncio.gather)
-        tasks = [api.check_url(url) for api in self.apis]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # 에러 처리 및 로깅
-        valid_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                log.error(f"API {self.apis[i].api_name} 예외 발생: {str(result)}")
-            elif isinstance(result, ExternalAPIResult):
-                valid_results.append(result)
-                log.info(
-                    f"  - {result.api_name}: "
-                    f"threat={result.is_threat}, "
-                    f"risk={result.risk_level.value}, "
-                    f"time={result.response_time_ms:.0f}ms"
-                )
+        if self._client is None:
+            self._bind_client()
 
-        return valid_results
+        log.info("외부 API {}개에 병렬 요청: {}", len(self.apis), url)
+
+        # 모든 API를 병렬로 호출 (완료되는 순서대로 처리)
+        tasks = {
+            asyncio.create_task(api.check_url_cached(url)): (index, api)
+            for index, api in enumerate(self.apis)
+        }
+        pending = set(tasks)
+        valid_results = []  # (API 순번, 결과)
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                # 에러 처리 및 로깅
+                high_risk_found = False
+                for task in done:
+                    index, api = tasks[task]
+                    error = task.exception()
+                    if error is not None:
+                        log.error("API {} 예외 발생: {}", api.api_name, error)
+                        continue
+
+                    result = task.result()
+                    valid_results.append((index, result))
+                    log.info(
+                        "  - {}: threat={}, risk={}, time={:.0f}ms",
+                        result.api_name,
+                        result.is_threat,
+                        result.risk_level.value,
+                        result.response_time_ms
+                    )
+                    if result.risk_level is RiskLevel.HIGH:
+                        high_risk_found = True
+
+                if high_risk_found and pending:
+                    log.info("HIGH 위험도 감지 - 남은 API {}개 요청 취소", len(pending))
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        valid_results.sort(key=itemgetter(0))
+        return [result for _, result in valid_results]
 
     @staticmethod
     def get_highest_risk(results: List[ExternalAPIResult]) -> Tuple[RiskLevel, str]:
@@ -110,18 +179,13 @@ class ExternalAPIManager:
         if not results:
             return RiskLevel.LOW, "none"
 
-        # 위험도 우선순위: HIGH(3) > MEDIUM(2) > LOW(1)
-        risk_priority = {
-            RiskLevel.HIGH: 3,
-            RiskLevel.MEDIUM: 2,
-            RiskLevel.LOW: 1
-        }
-
-        # 가장 높은 위험도를 가진 결과 찾기
-        highest_result = max(
-            results,
-            key=lambda r: risk_priority[r.risk_level]
-        )
+        # 가장 높은 위험도를 가진 결과 찾기 (HIGH가 나오면 즉시 반환)
+        highest_result = results[0]
+        for result in results:
+            if result.risk_level is RiskLevel.HIGH:
+                return result.risk_level, result.api_name
+            if result.risk_level.priority > highest_result.risk_level.priority:
+                highest_result = result
 
         return highest_result.risk_level, highest_result.api_name
 
@@ -133,6 +197,16 @@ class ExternalAPIManager:
         """외부 API 사용 여부"""
         return len(self.apis) > 0
 
+    async def aclose(self):
+        """
+        공유 HTTP 클라이언트 종료 (애플리케이션 종료 시 호출)
+
+        다음 check_url_all() 호출 시 새 클라이언트를 만들어 다시 연결합니다.
+        """
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
 
 # 싱글톤 인스턴스
 external_api_manager = ExternalAPIManager()
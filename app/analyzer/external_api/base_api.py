@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import httpx
 import time
+from cachetools import TTLCache
+from app.config import settings
 from app.models.analysis_result import RiskLevel, ExternalAPIResult
 from app.utils.logger import log
 
@@ -16,17 +18,30 @@ class ExternalAPIBase(ABC):
     - 타임아웃 관리
     - 에러 처리
     - 응답 시간 측정
+    - URL별 결과 캐시 (TTL)
     """
 
-    def __init__(self, api_key: str = "", timeout: int = 3):
+    # 결과 캐시 설정 (피싱 피드는 분 단위로 갱신되므로 짧은 TTL 사용)
+    CACHE_MAXSIZE = 10_000
+    CACHE_TTL_SECONDS = 300
+
+    def __init__(
+        self,
+        api_key: str = "",
+        timeout: int = 3,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         """
         Args:
             api_key: API 키 (필요한 경우)
             timeout: 요청 타임아웃 (초)
+            client: 공유 HTTP 클라이언트 (없으면 요청마다 새로 생성)
         """
         self.api_key = api_key
         self.timeout = timeout
+        self.client = client
         self.api_name = self.__class__.__name__
+        self._cache: TTLCache = TTLCache(maxsize=self.CACHE_MAXSIZE, ttl=self.CACHE_TTL_SECONDS)
 
     @abstractmethod
     async def check_url(self, url: str) -> ExternalAPIResult:
@@ -41,6 +56,33 @@ class ExternalAPIBase(ABC):
         """
         pass
 
+    async def check_url_cached(self, url: str) -> ExternalAPIResult:
+        """
+        캐시를 거쳐 URL 분석
+
+        TTL 안에 같은 URL을 다시 조회하면 네트워크 요청 없이 이전 결과를 반환합니다.
+        캐시된 결과의 응답 시간은 0ms이며, 에러 결과와 settings.max_cached_url_length보다
+        긴 URL의 결과는 캐시하지 않습니다.
+
+        Args:
+            url: 분석할 URL
+
+        Returns:
+            ExternalAPIResult: 분석 결과
+        """
+        if len(url) > settings.max_cached_url_length:
+            return await self.check_url(url)
+
+        cached = self._cache.get(url)
+        if cached is not None:
+            return cached
+
+        result = await self.check_url(url)
+        if 'error' not in result.details:
+            # 캐시 조회에는 네트워크 지연이 없으므로 응답 시간을 0으로 저장
+            self._cache[url] = result.model_copy(update={'response_time_ms': 0.0})
+        return result
+
     async def _make_request(
         self,
         method: str,
@@ -63,29 +105,32 @@ class ExternalAPIBase(ABC):
                 - response_time: float (응답 시간 ms, 성공 시)
                 - error: str (에러 메시지, 실패 시)
         """
+        method = method.upper()
+        if method not in ('GET', 'POST'):
+            return {'success': False, 'error': f'Unsupported method: {method}'}
+
         start_time = time.time()
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                if method.upper() == 'GET':
-                    response = await client.get(url, **kwargs)
-                elif method.upper() == 'POST':
-                    response = await client.post(url, **kwargs)
-                else:
-                    return {'success': False, 'error': f'Unsupported method: {method}'}
-
-                response.raise_for_status()
-                response_time = (time.time() - start_time) * 1000
-
-                return {
-                    'success': True,
-                    'data': response.json() if response.content else {},
-                    'status_code': response.status_code,
-                    'response_time': response_time
-                }
+            if self.client is not None:
+                # 공유 클라이언트: 커넥션 풀 재사용 (TCP/TLS 핸드셰이크 생략)
+                response = await self.client.request(method, url, **kwargs)
+            else:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    response = await client.request(method, url, **kwargs)
+
+            response.raise_for_status()
+            response_time = (time.time() - start_time) * 1000
+
+            return {
+                'success': True,
+                'data': response.json() if response.content else {},
+                'status_code': response.status_code,
+                'response_time': response_time
+            }
 
         except httpx.TimeoutException:
-            log.warning(f"{self.api_name} timeout for URL: {url}")
+            log.warning("{} timeout for URL: {}", self.api_name, url)
             return {
                 'success': False,
                 'error': 'timeout',
@@ -93,7 +138,7 @@ class ExternalAPIBase(ABC):
             }
 
         except httpx.HTTPStatusError as e:
-            log.warning(f"{self.api_name} HTTP error {e.response.status_code}: {url}")
+            log.warning("{} HTTP error {}: {}", self.api_name, e.response.status_code, url)
             return {
                 'success': False,
                 'error': f'HTTP {e.response.status_code}',
@@ -101,7 +146,7 @@ class ExternalAPIBase(ABC):
             }
 
         except Exception as e:
-            log.error(f"{self.api_name} error: {str(e)}")
+            log.error("{} error: {}", self.api_name, e)
             return {
                 'success': False,
                 'error': str(e),
@@ -13,6 +13,21 @@ class GoogleSafeBrowsingAPI(ExternalAPIBase):
 
     API_URL = "https://safebrowsing.googleapis.com/v4/threatMatches:find"
 
+    # 요청 페이로드의 고정 부분 (한 번만 생성, 요청 간 공유하며 수정하지 않음)
+    _CLIENT_INFO = {
+        "clientId": "credential-phishing-detector",
+        "clientVersion": "1.0.0"
+    }
+    _THREAT_INFO_TEMPLATE = {
+        "threatTypes": [
+            "MALWARE",
+            "SOCIAL_ENGINEERING",
+            "UNWANTED_SOFTWARE"
+        ],
+        "platformTypes": ["ANY_PLATFORM"],
+        "threatEntryTypes": ["URL"]
+    }
+
     async def check_url(self, url: str) -> ExternalAPIResult:
         """
         URL이 피싱/멀웨어 사이트인지 확인
@@ -26,20 +41,11 @@ class GoogleSafeBrowsingAPI(ExternalAPIBase):
         if not self.api_key:
             return self._create_error_result("API key not configured")
 
-        # 요청 페이로드 구성
+        # 요청 페이로드 구성 (고정 부분은 공유, URL이 들어가는 부분만 새로 생성)
         payload = {
-            "client": {
-                "clientId": "credential-phishing-detector",
-                "clientVersion": "1.0.0"
-            },
+            "client": self._CLIENT_INFO,
             "threatInfo": {
-                "threatTypes": [
-                    "MALWARE",
-                    "SOCIAL_ENGINEERING",
-                    "UNWANTED_SOFTWARE"
-                ],
-                "platformTypes": ["ANY_PLATFORM"],
-                "threatEntryTypes": ["URL"],
+                **self._THREAT_INFO_TEMPLATE,
                 "threatEntries": [{"url": url}]
             }
         }
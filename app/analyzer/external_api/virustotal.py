@@ -29,7 +29,7 @@ class VirusTotalAPI(ExternalAPIBase):
             return self._create_error_result("API key not configured")
 
         # URL ID 생성 (base64 인코딩, 패딩 제거)
-        url_id = base64.urlsafe_b64encode(url.encode()).decode().strip("=")
+        url_id = base64.urlsafe_b64encode(url.encode()).rstrip(b'=').decode('ascii')
 
         # API 헤더
         headers = {
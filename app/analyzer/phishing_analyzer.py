@@ -1,8 +1,9 @@
-from typing import Dict, Any, List, Tuple
+from typing import List, Tuple
 from app.analyzer.domain_analyzer import DomainAnalyzer
 from app.analyzer.blacklist import BlacklistManager
 from app.analyzer.external_api import external_api_manager
 from app.models.analysis_result import ExternalAPIResult
+from app.models.internal_analysis import InternalAnalysis
 from app.config import settings
 from app.utils.logger import log
 
@@ -19,11 +20,10 @@ class PhishingAnalyzer:
     """
 
     def __init__(self):
-        """초기화: 블랙리스트 매니저 및 도메인 분석기 생성"""
+        """초기화: 블랙리스트 매니저 생성 (DomainAnalyzer는 상태가 없으므로 인스턴스 불필요)"""
         self.blacklist = BlacklistManager()
-        self.domain_analyzer = DomainAnalyzer()
 
-    async def analyze(self, url: str) -> Tuple[Dict[str, Any], List[ExternalAPIResult]]:
+    async def analyze(self, url: str) -> Tuple[InternalAnalysis, List[ExternalAPIResult]]:
         """
         URL 종합 분석
 
@@ -31,51 +31,54 @@ class PhishingAnalyzer:
             url: 분석할 URL
 
         Returns:
-            Tuple[Dict[str, Any], List[ExternalAPIResult]]:
+            Tuple[InternalAnalysis, List[ExternalAPIResult]]:
                 - 내부 분석 결과 (도메인, 블랙리스트 등)
                 - 외부 API 결과 리스트
         """
-        log.info(f"피싱 분석 시작: {url}")
+        log.info("피싱 분석 시작: {}", url)
 
         # 1. 도메인 기본 분석
-        domain_analysis = self.domain_analyzer.analyze(url)
+        domain_analysis = DomainAnalyzer.analyze_readonly(url)
 
-        # 2. 블랙리스트 확인
+        # 2. 블랙리스트 확인 (호스트명 기준, 서브도메인 포함)
         domain = domain_analysis.get('domain', '')
+        hostname = domain_analysis.get('hostname', '') or domain
         in_blacklist = False
-        if domain:
-            in_blacklist = self.blacklist.is_blacklisted(domain)
+        if hostname:
+            # DomainAnalyzer가 소문자로 정규화한 호스트명이므로 변환 생략
+            in_blacklist = self.blacklist.is_blacklisted(hostname, assume_lowercase=True)
             if in_blacklist:
-                log.warning(f"블랙리스트 도메인 감지: {domain}")
+                log.warning("블랙리스트 도메인 감지: {}", hostname)
 
         # 내부 분석 결과 구성
-        internal_result = {
-            'url': url,
-            'in_blacklist': in_blacklist,
-            'is_ip_address': domain_analysis.get('is_ip_address', False),
-            'has_suspicious_pattern': domain_analysis.get('has_suspicious_pattern', False),
-            'subdomain_depth': domain_analysis.get('subdomain_depth', 0),
-            'domain': domain,
-            'tld': domain_analysis.get('tld', ''),
-            'hostname': domain_analysis.get('hostname', ''),
-            'is_valid_url': domain_analysis.get('is_valid_url', False)
-        }
+        internal_result = InternalAnalysis(
+            url=url,
+            in_blacklist=in_blacklist,
+            is_ip_address=domain_analysis.get('is_ip_address', False),
+            has_suspicious_pattern=domain_analysis.get('has_suspicious_pattern', False),
+            subdomain_depth=domain_analysis.get('subdomain_depth', 0),
+            domain=domain,
+            tld=domain_analysis.get('tld', ''),
+            hostname=domain_analysis.get('hostname', ''),
+            is_valid_url=domain_analysis.get('is_valid_url', False)
+        )
 
         log.info(
-            f"내부 분석 완료: blacklist={in_blacklist}, "
-            f"ip={internal_result['is_ip_address']}, "
-            f"suspicious={internal_result['has_suspicious_pattern']}"
+            "내부 분석 완료: blacklist={}, ip={}, suspicious={}",
+            in_blacklist,
+            internal_result.is_ip_address,
+            internal_result.has_suspicious_pattern
         )
 
         # 3. 외부 API 분석 (설정된 경우만)
         external_results = []
         if settings.enable_external_api and external_api_manager.is_enabled():
             try:
-                log.info(f"외부 API 분석 시작: {external_api_manager.get_enabled_api_count()}개 API")
+                log.info("외부 API 분석 시작: {}개 API", external_api_manager.get_enabled_api_count())
                 external_results = await external_api_manager.check_url_all(url)
-                log.info(f"외부 API 분석 완료: {len(external_results)}개 결과")
+                log.info("외부 API 분석 완료: {}개 결과", len(external_results))
             except Exception as e:
-                log.error(f"외부 API 분석 실패: {str(e)}")
+                log.error("외부 API 분석 실패: {}", e)
         else:
             log.debug("외부 API 미사용")
 
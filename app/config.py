@@ -1,5 +1,6 @@
+from functools import cached_property
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Tuple
 
 
 class Settings(BaseSettings):
@@ -27,6 +28,9 @@ class Settings(BaseSettings):
 
     # Analysis Settings
     analysis_timeout_seconds: int = 3
+    # URL 기준 캐시(도메인 분석, 인증 엔드포인트 검사, 외부 API 결과)에 넣을 최대 URL 길이
+    # (임의의 긴 고유 URL로 캐시 메모리가 커지는 것 방지, 더 긴 URL은 캐시 없이 분석)
+    max_cached_url_length: int = 2048
 
     # Risk Thresholds
     risk_threshold_high: int = 70
@@ -52,9 +56,14 @@ class Settings(BaseSettings):
             apis.append("phishtank")
         return apis
 
+    @cached_property
+    def enabled_apis_list(self) -> Tuple[str, ...]:
+        """활성화된 외부 API 목록 (설정은 프로세스 기동 시 고정되므로 한 번만 계산)"""
+        return tuple(self.get_enabled_apis())
+
     def is_external_api_enabled(self) -> bool:
         """외부 API 사용 여부 확인"""
-        return self.enable_external_api and len(self.get_enabled_apis()) > 0
+        return self.enable_external_api and len(self.enabled_apis_list) > 0
 
 
 # 싱글톤 인스턴스
@@ -1,7 +1,192 @@
+import json
 import re
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional
+from app.config import settings
 from app.models.analysis_request import AnalysisRequest
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick 미설치 시 정규식으로 검색
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+
+# credential 키워드 → 그룹 (0: 비밀번호 계열, 1: 사용자 식별 계열)
+_CREDENTIAL_KEYWORDS = {
+    'password': 0, 'passwd': 0, 'pwd': 0,
+    'username': 1, 'user': 1, 'email': 1, 'login': 1, 'id': 1,
+}
+
+# 인증 엔드포인트 키워드
+_AUTH_ENDPOINT_KEYWORDS = (
+    '/login', '/signin', '/sign-in', '/auth',
+    '/authenticate', '/session', '/oauth', '/sso',
+)
+
+# 두 credential 그룹이 모두 발견된 상태
+_ALL_CREDENTIAL_GROUPS = 0b11
+
+# 그룹별 키워드 집합 (body 키가 키워드와 정확히 일치하는지 빠르게 확인하는 용도)
+_PASSWORD_KEYS = frozenset(k for k, group in _CREDENTIAL_KEYWORDS.items() if group == 0)
+_IDENTITY_KEYS = frozenset(k for k, group in _CREDENTIAL_KEYWORDS.items() if group == 1)
+
+
+def _flatten_body(body: Dict[str, Any]) -> str:
+    """키워드 검색용 body 직렬화 (repr 대신 C 구현 JSON 직렬화 사용)"""
+    try:
+        if orjson is not None:
+            return orjson.dumps(body).decode('utf-8')
+        return json.dumps(body, ensure_ascii=False, separators=(',', ':'))
+    except (TypeError, ValueError):  # JSON으로 표현할 수 없는 값이 섞인 경우
+        return str(body)
+
+
+def _build_automaton(keywords: Dict[str, int]) -> Optional["ahocorasick.Automaton"]:
+    """
+    키워드 → 태그 매핑으로 Aho-Corasick 오토마톤 생성 (라이브러리 없으면 None)
+
+    소문자 키워드만 등록하므로 검색 대상 문자열은 한 번 소문자로 변환해서 넘깁니다.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword, tag in keywords.items():
+        automaton.add_word(keyword, tag)
+    automaton.make_automaton()
+    return automaton
+
+
+# credential 필드 패턴 (모듈 로드 시 한 번만 컴파일, 오토마톤이 없을 때 사용)
+_CREDENTIAL_PATTERNS = [
+    re.compile(
+        '|'.join(k for k, group in _CREDENTIAL_KEYWORDS.items() if group == target),
+        re.IGNORECASE
+    )
+    for target in (0, 1)
+]
+
+# 인증 엔드포인트 패턴 (단일 alternation으로 한 번에 검색)
+_AUTH_ENDPOINT_RE = re.compile(
+    '|'.join(re.escape(k) for k in _AUTH_ENDPOINT_KEYWORDS),
+    re.IGNORECASE
+)
+
+# 리터럴 키워드 다중 검색용 Aho-Corasick 오토마톤 (소문자 텍스트 대상)
+_CREDENTIAL_AC = _build_automaton(_CREDENTIAL_KEYWORDS)
+_AUTH_ENDPOINT_AC = _build_automaton({k: 0 for k in _AUTH_ENDPOINT_KEYWORDS})
+
+
+def detect(request: AnalysisRequest) -> bool:
+    """
+    로그인 시도 여부 판단
+
+    Args:
+        request: 분석할 HTTP 요청
+
+    Returns:
+        bool: 로그인 시도 여부
+    """
+    # 2개 이상의 지표가 있으면 로그인 시도로 판단
+    # body 전체를 스캔하는 credential 검사는 비용이 크므로 가장 마지막에 수행
+    indicator_count = (
+        _is_post_method(request)
+        + _has_auth_header(request)
+        + _is_auth_endpoint(request)
+    )
+    if indicator_count >= 2:
+        return True
+    if indicator_count == 0:
+        # 남은 지표가 하나뿐이라 2개에 도달할 수 없음
+        return False
+    return _has_credential_fields(request)
+
+
+def get_detection_details(request: AnalysisRequest) -> Dict[str, Any]:
+    """
+    감지 상세 정보 반환 (디버깅용)
+
+    Returns:
+        dict: 각 지표별 충족 여부
+    """
+    details: Dict[str, Any] = _compute_indicators(request)
+    details['is_login_attempt'] = sum(details.values()) >= 2
+    return details
+
+
+def _compute_indicators(request: AnalysisRequest) -> Dict[str, bool]:
+    """모든 지표를 한 번씩 평가"""
+    return {
+        'is_post': _is_post_method(request),
+        'has_credentials': _has_credential_fields(request),
+        'is_auth_endpoint': _is_auth_endpoint(request),
+        'has_auth_header': _has_auth_header(request)
+    }
+
+
+def _is_post_method(request: AnalysisRequest) -> bool:
+    """POST 메서드인지 확인"""
+    return request.method_upper == 'POST'
+
+
+def _has_credential_fields(request: AnalysisRequest) -> bool:
+    """
+    credential 필드 포함 여부 확인
+    username/email + password 패턴이 모두 있어야 함
+    """
+    if not request.body:
+        return False
+
+    # 대부분의 로그인 body는 {"username": ..., "password": ...}처럼 키가 키워드 그대로이므로
+    # 직렬화 없이 집합 연산으로 먼저 확인 (키 일치는 전체 스캔에서도 항상 일치)
+    if not _PASSWORD_KEYS.isdisjoint(request.body) and not _IDENTITY_KEYS.isdisjoint(request.body):
+        return True
+
+    # body를 문자열로 변환
+    body_str = _flatten_body(request.body)
+
+    if _CREDENTIAL_AC is not None:
+        # 한 번의 스캔으로 두 그룹이 모두 발견되면 즉시 종료
+        found = 0
+        for _, group in _CREDENTIAL_AC.iter(body_str.lower()):
+            found |= 1 << group
+            if found == _ALL_CREDENTIAL_GROUPS:
+                return True
+        return False
+
+    # 모든 credential 패턴이 존재하는지 확인
+    return all(pattern.search(body_str) for pattern in _CREDENTIAL_PATTERNS)
+
+
+def _is_auth_endpoint(request: AnalysisRequest) -> bool:
+    """인증 관련 엔드포인트인지 확인"""
+    url = request.url
+    if len(url) > settings.max_cached_url_length:
+        return _url_has_auth_keyword.__wrapped__(url)
+    return _url_has_auth_keyword(url)
+
+
+@lru_cache(maxsize=2048)
+def _url_has_auth_keyword(url: str) -> bool:
+    """
+    URL에 인증 엔드포인트 키워드가 있는지 확인 (URL별 결과 캐시)
+
+    같은 로그인 URL이 반복해서 들어오므로 URL 문자열 단위로 결과를 재사용합니다.
+    body는 값까지 검사 대상이라 키 구성만으로 결과를 캐시할 수 없어 캐시하지 않습니다.
+    """
+    if _AUTH_ENDPOINT_AC is not None:
+        return next(_AUTH_ENDPOINT_AC.iter(url.lower()), None) is not None
+    return _AUTH_ENDPOINT_RE.search(url) is not None
+
+
+def _has_auth_header(request: AnalysisRequest) -> bool:
+    """Authorization 헤더가 있는지 확인"""
+    return 'authorization' in request.header_keys_lower
+
 
 class LoginDetector:
     """
@@ -14,100 +199,15 @@ class LoginDetector:
     - Authorization 헤더 존재
 
     2개 이상의 지표가 충족되면 로그인 시도로 판단합니다.
+    실제 구현은 모듈 수준 함수이며, 이 클래스는 기존 호출부를 위한 네임스페이스입니다.
     """
 
-    # credential 필드 패턴
-    CREDENTIAL_PATTERNS = [
-        r'password|passwd|pwd',
-        r'username|user|email|login|id'
-    ]
-
-    # 인증 엔드포인트 패턴
-    AUTH_ENDPOINTS = [
-        r'/login',
-        r'/signin',
-        r'/sign-in',
-        r'/auth',
-        r'/authenticate',
-        r'/session',
-        r'/oauth',
-        r'/sso'
-    ]
-
-    @classmethod
-    def detect(cls, request: AnalysisRequest) -> bool:
-        """
-        로그인 시도 여부 판단
-
-        Args:
-            request: 분석할 HTTP 요청
-
-        Returns:
-            bool: 로그인 시도 여부
-        """
-        indicators = {
-            'is_post': cls._is_post_method(request),
-            'has_credentials': cls._has_credential_fields(request),
-            'is_auth_endpoint': cls._is_auth_endpoint(request),
-            'has_auth_header': cls._has_auth_header(request)
-        }
-
-        # 2개 이상의 지표가 있으면 로그인 시도로 판단
-        indicator_count = sum(indicators.values())
-        return indicator_count >= 2
-
-    @classmethod
-    def _is_post_method(cls, request: AnalysisRequest) -> bool:
-        """POST 메서드인지 확인"""
-        return request.method.upper() == 'POST'
-
-    @classmethod
-    def _has_credential_fields(cls, request: AnalysisRequest) -> bool:
-        """
-        credential 필드 포함 여부 확인
-        username/email + password 패턴이 모두 있어야 함
-        """
-        if not request.body:
-            return False
-
-        # body를 문자열로 변환 (dict, str 모두 처리)
-        if isinstance(request.body, dict):
-            body_str = str(request.body).lower()
-        else:
-            body_str = str(request.body).lower()
-
-        # 모든 credential 패턴이 존재하는지 확인
-        return all(
-            re.search(pattern, body_str, re.IGNORECASE)
-            for pattern in cls.CREDENTIAL_PATTERNS
-        )
-
-    @classmethod
-    def _is_auth_endpoint(cls, request: AnalysisRequest) -> bool:
-        """인증 관련 엔드포인트인지 확인"""
-        url_lower = request.url.lower()
-        return any(
-            re.search(pattern, url_lower, re.IGNORECASE)
-            for pattern in cls.AUTH_ENDPOINTS
-        )
-
-    @classmethod
-    def _has_auth_header(cls, request: AnalysisRequest) -> bool:
-        """Authorization 헤더가 있는지 확인"""
-        return 'authorization' in [h.lower() for h in request.headers.keys()]
-
-    @classmethod
-    def get_detection_details(cls, request: AnalysisRequest) -> Dict[str, Any]:
-        """
-        감지 상세 정보 반환 (디버깅용)
-
-        Returns:
-            dict: 각 지표별 충족 여부
-        """
-        return {
-            'is_post': cls._is_post_method(request),
-            'has_credentials': cls._has_credential_fields(request),
-            'is_auth_endpoint': cls._is_auth_endpoint(request),
-            'has_auth_header': cls._has_auth_header(request),
-            'is_login_attempt': cls.detect(request)
-        }
+    CREDENTIAL_PATTERNS = _CREDENTIAL_PATTERNS
+    AUTH_ENDPOINT_RE = _AUTH_ENDPOINT_RE
+
+    detect = staticmethod(detect)
+    get_detection_details = staticmethod(get_detection_details)
+    _is_post_method = staticmethod(_is_post_method)
+    _has_credential_fields = staticmethod(_has_credential_fields)
+    _is_auth_endpoint = staticmethod(_is_auth_endpoint)
+    _has_auth_header = staticmethod(_has_auth_header)
@@ -1,16 +1,34 @@
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse, HTMLResponse
+import asyncio
+from string import Template
+from typing import Annotated, Any, Dict, List, Union
+from fastapi import Body, FastAPI, Request, HTTPException
+from fastapi.responses import JSONResponse, HTMLResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from app.detector.login_detector import LoginDetector
+from app.detector import login_detector
 from app.analyzer.phishing_analyzer import PhishingAnalyzer
 from app.risk_engine.risk_calculator import RiskCalculator
 from app.models.analysis_request import AnalysisRequest
-from app.models.analysis_result import Action
+from app.models.analysis_result import Action, AnalysisResult
+from app.analyzer.external_api import external_api_manager
 from app.utils.logger import log, setup_logger
 
+try:
+    import orjson  # noqa: F401  (ORJSONResponse에 필요)
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+
+# 일괄 분석 API 한 번에 받을 수 있는 최대 요청 수
+_MAX_BATCH_SIZE = 100
+
+# HTTP 요청 본문이 이보다 크면 로그인 감지를 스레드풀에서 수행
+# (감지 비용은 body 직렬화/스캔 길이에 비례, 작은 요청은 스레드 전환 비용이 더 큼)
+_DETECT_OFFLOAD_BODY_BYTES = 64 * 1024
+
 
 # 애플리케이션 시작/종료 시 실행될 코드
 @asynccontextmanager
@@ -25,13 +43,14 @@ async def lifespan(app: FastAPI):
     log.info(f"Debug: {settings.debug}")
     log.info(f"외부 API 활성화: {settings.enable_external_api}")
     if settings.enable_external_api:
-        enabled_apis = settings.get_enabled_apis()
+        enabled_apis = settings.enabled_apis_list
         log.info(f"활성화된 외부 API: {', '.join(enabled_apis) if enabled_apis else '없음'}")
     log.info("=" * 60)
 
     yield
 
     # 종료 시
+    await external_api_manager.aclose()
     log.info("Credential Phishing Detection System 종료")
 
 
@@ -40,7 +59,9 @@ app = FastAPI(
     title="Credential Phishing Detection System",
     description="HTTP 요청을 분석하여 credential phishing 공격을 탐지하고 차단하는 보안 시스템",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # JSON 응답은 orjson으로 직렬화 (미설치 시 표준 json)
+    default_response_class=ORJSONResponse if _ORJSON_AVAILABLE else JSONResponse
 )
 
 # CORS 설정 (필요한 경우)
@@ -79,6 +100,7 @@ async def root():
             <h3>API 엔드포인트</h3>
             <ul>
                 <li><code>POST /api/v1/analyze</code> - 요청 분석</li>
+                <li><code>POST /api/v1/analyze/batch</code> - 여러 요청 일괄 분석</li>
                 <li><code>GET /health</code> - 헬스 체크</li>
                 <li><code>GET /docs</code> - API 문서 (Swagger UI)</li>
                 <li><code>GET /redoc</code> - API 문서 (ReDoc)</li>
@@ -89,8 +111,73 @@ async def root():
     """
 
 
+async def _analyze_single(
+    request: AnalysisRequest,
+    offload_detection: bool = False
+) -> Union[Dict[str, Any], AnalysisResult]:
+    """
+    단일 요청 분석 (로그인 감지 → 피싱 분석 → 위험도 계산)
+
+    Args:
+        request: 분석할 요청
+        offload_detection: 로그인 감지를 스레드풀에서 수행할지 여부 (큰 본문)
+
+    Returns:
+        로그인 시도가 아니면 통과 정보 dict, 로그인 시도면 AnalysisResult
+    """
+    # 1. 로그인 시도 감지
+    if offload_detection and request.body:
+        # 큰 body 스캔이 이벤트 루프를 막지 않도록 스레드풀로 넘김
+        loop = asyncio.get_running_loop()
+        is_login = await loop.run_in_executor(None, login_detector.detect, request)
+    else:
+        is_login = login_detector.detect(request)
+
+    if not is_login:
+        log.info("로그인 시도 아님 - 정상 통과")
+        return {
+            "is_login_attempt": False,
+            "action": "allowed",
+            "message": "Not a login attempt"
+        }
+
+    log.info("✓ 로그인 시도 감지됨")
+
+    # 2. 피싱 사이트 분석 (내부 + 외부 API)
+    internal_analysis, external_results = await phishing_analyzer.analyze(request.url)
+
+    # 3. 위험도 계산
+    result = RiskCalculator.calculate(internal_analysis, external_results)
+
+    # 4. 로그 기록
+    log.info(
+        f"분석 완료 - "
+        f"URL: {request.url}, "
+        f"위험도: {result.risk_level.value}, "
+        f"점수: {result.score}, "
+        f"액션: {result.action.value}, "
+        f"결정 소스: {result.risk_decision_source}"
+    )
+
+    # 외부 API 결과 개별 로깅
+    if result.external_api_results:
+        for api_result in result.external_api_results:
+            log.info(
+                f"  외부 API - {api_result.api_name}: "
+                f"threat={api_result.is_threat}, "
+                f"risk={api_result.risk_level.value}"
+            )
+
+    return result
+
+
+def _is_large_body(raw_body: bytes) -> bool:
+    """로그인 감지를 스레드풀로 넘길 만큼 본문이 큰지 확인"""
+    return len(raw_body) > _DETECT_OFFLOAD_BODY_BYTES
+
+
 @app.post("/api/v1/analyze")
-async def analyze_request(request: AnalysisRequest):
+async def analyze_request(request: AnalysisRequest, http_request: Request):
     """
     요청 분석 API
 
@@ -100,50 +187,16 @@ async def analyze_request(request: AnalysisRequest):
     log.info(f"분석 요청 수신: {request.method} {request.url}")
 
     try:
-        # 1. 로그인 시도 감지
-        is_login = LoginDetector.detect(request)
-
-        if not is_login:
-            log.info("로그인 시도 아님 - 정상 통과")
-            return {
-                "is_login_attempt": False,
-                "action": "allowed",
-                "message": "Not a login attempt"
-            }
-
-        log.info("✓ 로그인 시도 감지됨")
+        # 모델 파싱 시 읽어 둔 원본 본문을 재사용하므로 추가 읽기 비용 없음
+        raw_body = await http_request.body()
+        result = await _analyze_single(request, _is_large_body(raw_body))
 
-        # 2. 피싱 사이트 분석 (내부 + 외부 API)
-        internal_analysis, external_results = await phishing_analyzer.analyze(request.url)
-
-        # 3. 위험도 계산
-        result = RiskCalculator.calculate(internal_analysis, external_results)
-
-        # 4. 로그 기록
-        log.info(
-            f"분석 완료 - "
-            f"URL: {request.url}, "
-            f"위험도: {result.risk_level.value}, "
-            f"점수: {result.score}, "
-            f"액션: {result.action.value}, "
-            f"결정 소스: {result.risk_decision_source}"
-        )
-
-        # 외부 API 결과 개별 로깅
-        if result.external_api_results:
-            for api_result in result.external_api_results:
-                log.info(
-                    f"  외부 API - {api_result.api_name}: "
-                    f"threat={api_result.is_threat}, "
-                    f"risk={api_result.risk_level.value}"
-                )
-
-        # 5. 차단된 경우 경고 페이지 반환
-        if result.action == Action.BLOCKED:
+        # 차단된 경우 경고 페이지 반환
+        if isinstance(result, AnalysisResult) and result.action == Action.BLOCKED:
             html_content = render_warning_page(request.url, result)
             return HTMLResponse(content=html_content, status_code=403)
 
-        # 6. 경고 또는 허용
+        # 경고 또는 허용
         return result
 
     except Exception as e:
@@ -151,6 +204,39 @@ async def analyze_request(request: AnalysisRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@app.post("/api/v1/analyze/batch")
+async def analyze_batch(
+    requests: Annotated[List[AnalysisRequest], Body(max_length=_MAX_BATCH_SIZE)],
+    http_request: Request
+):
+    """
+    일괄 요청 분석 API
+
+    여러 HTTP 요청을 한 번에 분석하며, 외부 API 조회는 요청 간에 동시에 수행합니다.
+    결과는 요청 순서대로 반환하고, 차단 대상도 경고 페이지 대신 분석 결과
+    (warning_page_url 포함)로 반환합니다.
+    - 최대 개수를 넘는 배치는 항목 검증 전에 거부 (422)
+    - 분석 중 오류가 난 항목은 해당 위치에 error 항목을 반환하고 나머지는 그대로 반환
+    """
+    log.info(f"일괄 분석 요청 수신: {len(requests)}건")
+
+    offload_detection = _is_large_body(await http_request.body())
+    results = await asyncio.gather(
+        *(_analyze_single(request, offload_detection) for request in requests),
+        return_exceptions=True
+    )
+
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            log.opt(exception=result).error(
+                f"일괄 분석 중 오류 발생 ({index}번째 요청): {str(result)}"
+            )
+            results[index] = {"error": "Internal server error"}
+        elif isinstance(result, BaseException):  # 취소 등은 그대로 전파
+            raise result
+    return results
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -162,7 +248,7 @@ async def health_check():
         "status": "healthy",
         "version": "0.1.0",
         "external_apis_enabled": settings.enable_external_api,
-        "active_apis": settings.get_enabled_apis(),
+        "active_apis": settings.enabled_apis_list,
         "blacklist_count": phishing_analyzer.get_blacklist_count(),
         "settings": {
             "risk_threshold_high": settings.risk_threshold_high,
@@ -172,77 +258,56 @@ async def health_check():
     }
 
 
-def render_warning_page(url: str, result) -> str:
-    """
-    경고 페이지 HTML 렌더링
-
-    Args:
-        url: 차단된 URL
-        result: 분석 결과
-
-    Returns:
-        str: HTML 콘텐츠
-    """
-    reasons_html = "\n".join(f"<li>{reason}</li>" for reason in result.reasons)
-
-    # 외부 API 결과 표시
-    api_results_html = ""
-    if result.external_api_results:
-        api_results_html = "<h3>외부 API 분석 결과</h3><ul>"
-        for api_result in result.external_api_results:
-            threat_emoji = "🚨" if api_result.is_threat else "✅"
-            api_results_html += f"<li>{threat_emoji} {api_result.api_name}: {api_result.risk_level.value}</li>"
-        api_results_html += "</ul>"
-
-    return f"""
+# 경고 페이지 템플릿 (모듈 로드 시 한 번만 생성, 요청마다 값만 치환)
+_WARNING_PAGE_TEMPLATE = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <title>⚠️ 위험한 사이트 차단</title>
         <meta charset="UTF-8">
         <style>
-            body {{
+            body {
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
                 max-width: 700px;
                 margin: 50px auto;
                 padding: 30px;
                 background: #f5f5f5;
-            }}
-            .container {{
+            }
+            .container {
                 background: white;
                 padding: 40px;
                 border-radius: 10px;
                 box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }}
-            h1 {{
+            }
+            h1 {
                 color: #e74c3c;
                 margin-top: 0;
-            }}
-            .risk-badge {{
+            }
+            .risk-badge {
                 display: inline-block;
                 padding: 8px 16px;
                 border-radius: 20px;
                 font-weight: bold;
                 background: #e74c3c;
                 color: white;
-            }}
-            .url-box {{
+            }
+            .url-box {
                 background: #ecf0f1;
                 padding: 15px;
                 border-radius: 5px;
                 word-break: break-all;
                 margin: 20px 0;
-            }}
-            ul {{
+            }
+            ul {
                 line-height: 1.8;
-            }}
-            .footer {{
+            }
+            .footer {
                 margin-top: 30px;
                 padding-top: 20px;
                 border-top: 1px solid #ecf0f1;
                 color: #7f8c8d;
                 font-size: 14px;
-            }}
+            }
         </style>
     </head>
     <body>
@@ -250,26 +315,26 @@ def render_warning_page(url: str, result) -> str:
             <h1>⚠️ 위험한 사이트가 차단되었습니다</h1>
 
             <p>
-                <span class="risk-badge">위험도: {result.risk_level.value.upper()}</span>
+                <span class="risk-badge">위험도: ${risk_level}</span>
             </p>
 
             <div class="url-box">
                 <strong>차단된 URL:</strong><br>
-                {url}
+                ${url}
             </div>
 
             <h3>차단 이유:</h3>
             <ul>
-                {reasons_html}
+                ${reasons_html}
             </ul>
 
-            {api_results_html}
+            ${api_results_html}
 
             <h3>📋 상세 정보</h3>
             <ul>
-                <li><strong>위험도 점수:</strong> {result.score}/100</li>
-                <li><strong>결정 소스:</strong> {result.risk_decision_source}</li>
-                <li><strong>액션:</strong> {result.action.value}</li>
+                <li><strong>위험도 점수:</strong> ${score}/100</li>
+                <li><strong>결정 소스:</strong> ${decision_source}</li>
+                <li><strong>액션:</strong> ${action}</li>
             </ul>
 
             <div class="footer">
@@ -279,7 +344,41 @@ def render_warning_page(url: str, result) -> str:
         </div>
     </body>
     </html>
+    """)
+
+
+def render_warning_page(url: str, result) -> str:
+    """
+    경고 페이지 HTML 렌더링
+
+    Args:
+        url: 차단된 URL
+        result: 분석 결과
+
+    Returns:
+        str: HTML 콘텐츠
     """
+    reasons_html = "\n".join(f"<li>{reason}</li>" for reason in result.reasons)
+
+    # 외부 API 결과 표시
+    api_results_html = ""
+    if result.external_api_results:
+        api_items = "".join(
+            f"<li>{'🚨' if api_result.is_threat else '✅'} "
+            f"{api_result.api_name}: {api_result.risk_level.value}</li>"
+            for api_result in result.external_api_results
+        )
+        api_results_html = f"<h3>외부 API 분석 결과</h3><ul>{api_items}</ul>"
+
+    return _WARNING_PAGE_TEMPLATE.substitute(
+        risk_level=result.risk_level.value.upper(),
+        url=url,
+        reasons_html=reasons_html,
+        api_results_html=api_results_html,
+        score=result.score,
+        decision_source=result.risk_decision_source,
+        action=result.action.value,
+    )
 
 
 # 개발 서버 실행 (uvicorn 대신 직접 실행 시)
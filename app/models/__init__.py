@@ -1,4 +1,5 @@
 from app.models.analysis_request import AnalysisRequest
+from app.models.internal_analysis import InternalAnalysis
 from app.models.analysis_result import (
     AnalysisResult,
     RiskLevel,
@@ -8,6 +9,7 @@ from app.models.analysis_result import (
 
 __all__ = [
     "AnalysisRequest",
+    "InternalAnalysis",
     "AnalysisResult",
     "RiskLevel",
     "Action",
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from datetime import datetime
 from typing import Optional, Dict, Any
 
@@ -12,8 +12,30 @@ class AnalysisRequest(BaseModel):
     body: Optional[Dict[str, Any]] = Field(None, description="요청 본문 (POST 데이터)")
     timestamp: datetime = Field(default_factory=datetime.now, description="요청 시각")
 
-    class Config:
-        json_schema_extra = {
+    # 생성 시 한 번 계산하는 파생 값 (__dict__가 아닌 private 속성에 두어 모델 비교에 영향 없음)
+    _method_upper: str = PrivateAttr(default='')
+    _header_keys_lower: frozenset = PrivateAttr(default=frozenset())
+
+    def model_post_init(self, __context: Any) -> None:
+        """파생 값 계산"""
+        self._method_upper = self.method.upper()
+        self._header_keys_lower = frozenset(name.lower() for name in self.headers)
+
+    @property
+    def method_upper(self) -> str:
+        """대문자로 정규화한 HTTP 메서드 (생성 시 한 번만 계산)"""
+        return self._method_upper
+
+    @property
+    def header_keys_lower(self) -> frozenset:
+        """소문자로 정규화한 헤더 이름 집합 (생성 시 한 번만 계산)"""
+        return self._header_keys_lower
+
+    # 요청마다 생성되는 모델이므로 생성 후 변경을 막고 할당 검증을 생략
+    model_config = ConfigDict(
+        frozen=True,
+        validate_assignment=False,
+        json_schema_extra={
             "example": {
                 "url": "https://example.com/login",
                 "method": "POST",
@@ -22,3 +44,4 @@ class AnalysisRequest(BaseModel):
                 "timestamp": "2026-02-03T10:30:00"
             }
         }
+    )
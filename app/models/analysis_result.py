@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -9,6 +9,18 @@ class RiskLevel(str, Enum):
     MEDIUM = "medium"
     LOW = "low"
 
+    @property
+    def priority(self) -> int:
+        """비교용 우선순위 (HIGH(3) > MEDIUM(2) > LOW(1))"""
+        return _PRIORITY[self]
+
+
+_PRIORITY = {
+    RiskLevel.HIGH: 3,
+    RiskLevel.MEDIUM: 2,
+    RiskLevel.LOW: 1
+}
+
 
 class Action(str, Enum):
     """취할 액션"""
@@ -48,8 +60,11 @@ class AnalysisResult(BaseModel):
         description="위험도 결정 소스 (internal 또는 API 이름)"
     )
 
-    class Config:
-        json_schema_extra = {
+    # 계산이 끝난 결과는 변경하지 않음 (불변 모델)
+    model_config = ConfigDict(
+        frozen=True,
+        validate_assignment=False,
+        json_schema_extra={
             "example": {
                 "is_login_attempt": True,
                 "is_phishing": True,
@@ -73,3 +88,4 @@ class AnalysisResult(BaseModel):
                 "risk_decision_source": "Google Safe Browsing"
             }
         }
+    )
@@ -0,0 +1,28 @@
+from dataclasses import dataclass, fields
+from typing import Dict, Any
+
+
+@dataclass(slots=True, frozen=True)
+class InternalAnalysis:
+    """
+    내부 분석 결과 (도메인 분석 + 블랙리스트)
+
+    위험도 계산 시 매번 dict 키를 해싱하지 않도록 slot 기반 필드로 보관합니다.
+    """
+    url: str = ''
+    in_blacklist: bool = False
+    is_ip_address: bool = False
+    has_suspicious_pattern: bool = False
+    subdomain_depth: int = 0
+    domain: str = ''
+    tld: str = ''
+    hostname: str = ''
+    is_valid_url: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InternalAnalysis":
+        """dict 형식의 분석 결과 변환 (알 수 없는 키는 무시)"""
+        return cls(**{name: data[name] for name in _FIELD_NAMES if name in data})
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(InternalAnalysis))
@@ -1,8 +1,40 @@
-from typing import List, Dict, Any, Tuple
+from operator import attrgetter
+from typing import List, Dict, Any, Tuple, Union
 from app.models.analysis_result import AnalysisResult, RiskLevel, Action, ExternalAPIResult
+from app.models.internal_analysis import InternalAnalysis
 from app.config import settings
 from app.utils.logger import log
 
+# 내부 분석 판단 근거 문구
+_REASON_BLACKLIST = '알려진 피싱 사이트 블랙리스트에 등재됨'
+_REASON_IP = '도메인 대신 IP 주소를 직접 사용'
+_REASON_PATTERN = '의심스러운 URL 패턴 감지 (@, 긴 무작위 문자열 등)'
+_REASON_INVALID = '유효하지 않은 URL 형식'
+
+# 참/거짓 지표별 가중치 규칙: (지표 조회 함수, 점수, 판단 근거)
+_FLAG_RULES = (
+    (attrgetter('in_blacklist'), 50, _REASON_BLACKLIST),
+    (attrgetter('is_ip_address'), 40, _REASON_IP),
+    (attrgetter('has_suspicious_pattern'), 25, _REASON_PATTERN),
+)
+
+# 깊은 서브도메인 기준 및 점수
+_SUBDOMAIN_DEPTH_LIMIT = 3
+_SUBDOMAIN_SCORE = 15
+
+# 유효하지 않은 URL 점수
+_INVALID_URL_SCORE = 30
+
+# 피싱으로 판단하는 위험도
+_PHISHING_LEVELS = frozenset({RiskLevel.HIGH, RiskLevel.MEDIUM})
+
+# 위험도별 액션
+_RISK_TO_ACTION = {
+    RiskLevel.HIGH: Action.BLOCKED,
+    RiskLevel.MEDIUM: Action.WARNED,
+    RiskLevel.LOW: Action.ALLOWED,
+}
+
 
 class RiskCalculator:
     """
@@ -18,14 +50,14 @@ class RiskCalculator:
 
     @staticmethod
     def calculate(
-        internal_analysis: Dict[str, Any],
+        internal_analysis: Union[InternalAnalysis, Dict[str, Any]],
         external_results: List[ExternalAPIResult]
     ) -> AnalysisResult:
         """
         최종 위험도 계산
 
         Args:
-            internal_analysis: 내부 분석 결과 (도메인 분석, 블랙리스트 등)
+            internal_analysis: 내부 분석 결과 (도메인 분석, 블랙리스트 등, dict도 허용)
             external_results: 외부 API 결과 리스트
 
         Returns:
@@ -33,7 +65,7 @@ class RiskCalculator:
         """
         # 1. 내부 분석 점수 계산
         internal_score, internal_reasons = RiskCalculator._calculate_internal_score(
-            internal_analysis
+            RiskCalculator._as_internal_analysis(internal_analysis)
         )
 
         # 2. 외부 API 결과 확인
@@ -56,7 +88,7 @@ class RiskCalculator:
 
         return AnalysisResult(
             is_login_attempt=True,
-            is_phishing=final_risk_level in [RiskLevel.HIGH, RiskLevel.MEDIUM],
+            is_phishing=final_risk_level in _PHISHING_LEVELS,
             risk_level=final_risk_level,
             score=final_score,
             reasons=final_reasons,
@@ -67,7 +99,19 @@ class RiskCalculator:
         )
 
     @staticmethod
-    def _calculate_internal_score(analysis: Dict[str, Any]) -> Tuple[int, List[str]]:
+    def _as_internal_analysis(
+        analysis: Union[InternalAnalysis, Dict[str, Any]]
+    ) -> InternalAnalysis:
+        """dict 형식의 내부 분석 결과를 InternalAnalysis로 변환"""
+        if isinstance(analysis, InternalAnalysis):
+            return analysis
+        return InternalAnalysis.from_dict(analysis)
+
+    @staticmethod
+    def _calculate_internal_score(
+        analysis: InternalAnalysis,
+        with_reasons: bool = True
+    ) -> Tuple[int, List[str]]:
         """
         내부 분석 점수 계산
 
@@ -76,9 +120,11 @@ class RiskCalculator:
         - IP 주소 직접 사용: +40점
         - 의심스러운 패턴: +25점
         - 깊은 서브도메인 (>3): +15점
+        - 유효하지 않은 URL: +30점
 
         Args:
             analysis: 내부 분석 결과
+            with_reasons: False면 이유 문자열을 만들지 않음 (이유 목록은 빈 리스트)
 
         Returns:
             Tuple[int, List[str]]: (점수, 이유 목록)
@@ -86,31 +132,25 @@ class RiskCalculator:
         score = 0
         reasons = []
 
-        # 블랙리스트 확인
-        if analysis.get('in_blacklist'):
-            score += 50
-            reasons.append('알려진 피싱 사이트 블랙리스트에 등재됨')
-
-        # IP 주소 사용
-        if analysis.get('is_ip_address'):
-            score += 40
-            reasons.append('도메인 대신 IP 주소를 직접 사용')
-
-        # 의심스러운 URL 패턴
-        if analysis.get('has_suspicious_pattern'):
-            score += 25
-            reasons.append('의심스러운 URL 패턴 감지 (@, 긴 무작위 문자열 등)')
+        # 블랙리스트, IP 주소, 의심스러운 URL 패턴
+        for flag, weight, reason in _FLAG_RULES:
+            if flag(analysis):
+                score += weight
+                if with_reasons:
+                    reasons.append(reason)
 
         # 깊은 서브도메인
-        subdomain_depth = analysis.get('subdomain_depth', 0)
-        if subdomain_depth > 3:
-            score += 15
-            reasons.append(f'비정상적으로 깊은 서브도메인 ({subdomain_depth}단계)')
+        subdomain_depth = analysis.subdomain_depth
+        if subdomain_depth > _SUBDOMAIN_DEPTH_LIMIT:
+            score += _SUBDOMAIN_SCORE
+            if with_reasons:
+                reasons.append(f'비정상적으로 깊은 서브도메인 ({subdomain_depth}단계)')
 
         # URL 유효하지 않음
-        if not analysis.get('is_valid_url'):
-            score += 30
-            reasons.append('유효하지 않은 URL 형식')
+        if not analysis.is_valid_url:
+            score += _INVALID_URL_SCORE
+            if with_reasons:
+                reasons.append(_REASON_INVALID)
 
         return score, reasons
 
@@ -130,18 +170,16 @@ class RiskCalculator:
         if not results:
             return RiskLevel.LOW, [], "internal"
 
-        # 위험도 우선순위
-        risk_priority = {
-            RiskLevel.HIGH: 3,
-            RiskLevel.MEDIUM: 2,
-            RiskLevel.LOW: 1
-        }
-
-        # 가장 높은 위험도 찾기
-        highest_result = max(results, key=lambda r: risk_priority[r.risk_level])
-
+        # 한 번의 순회로 가장 높은 위험도와 이유 목록을 함께 수집
+        highest_result = results[0]
+        highest_priority = highest_result.risk_level.priority
         reasons = []
         for result in results:
+            priority = result.risk_level.priority
+            if priority > highest_priority:
+                highest_result = result
+                highest_priority = priority
+
             if result.is_threat:
                 reason = f"{result.api_name}: 위협 탐지 (위험도: {result.risk_level.value})"
 
@@ -196,14 +234,8 @@ class RiskCalculator:
         else:
             internal_risk = RiskLevel.LOW
 
-        risk_priority = {
-            RiskLevel.HIGH: 3,
-            RiskLevel.MEDIUM: 2,
-            RiskLevel.LOW: 1
-        }
-
         # 더 높은 위험도 선택
-        if risk_priority[external_risk] > risk_priority[internal_risk]:
+        if external_risk.priority > internal_risk.priority:
             log.info(
                 f"외부 API 위험도가 더 높음: {external_risk.value} > {internal_risk.value} "
                 f"(source: {external_source})"
@@ -232,15 +264,10 @@ class RiskCalculator:
         Returns:
             Action: 취할 액션
         """
-        if risk_level == RiskLevel.HIGH:
-            return Action.BLOCKED
-        elif risk_level == RiskLevel.MEDIUM:
-            return Action.WARNED
-        else:
-            return Action.ALLOWED
+        return _RISK_TO_ACTION[risk_level]
 
     @staticmethod
-    def calculate_score_only(internal_analysis: Dict[str, Any]) -> int:
+    def calculate_score_only(internal_analysis: Union[InternalAnalysis, Dict[str, Any]]) -> int:
         """
         내부 분석 점수만 계산 (디버깅/테스트용)
 
@@ -250,5 +277,9 @@ class RiskCalculator:
         Returns:
             int: 점수
         """
-        score, _ = RiskCalculator._calculate_internal_score(internal_analysis)
+        # 이유 문자열은 만들지 않고 가중치만 합산
+        score, _ = RiskCalculator._calculate_internal_score(
+            RiskCalculator._as_internal_analysis(internal_analysis),
+            with_reasons=False
+        )
         return score
@@ -4,31 +4,41 @@ import re
 from pathlib import Path
 
 
+# 민감정보 패턴 (한 번의 스캔으로 모든 키워드 처리)
+# - 그룹 1: JSON 형식 "password": "value"
+# - 그룹 2: URL 쿼리 형식 password=value
+_MASK_RE = re.compile(
+    r'("(?:password|passwd|pwd|token|api_key|secret)"\s*:\s*)"[^"]*"'
+    r'|((?:password|passwd|pwd|token)=)[^&\s]*',
+    re.IGNORECASE
+)
+
+
+# 마스킹 대상 키워드 (하나도 없으면 정규식 검사 생략)
+_TRIGGERS = ('password', 'passwd', 'pwd', 'token', 'api_key', 'secret')
+
+
+def _mask_repl(match: re.Match) -> str:
+    """매칭된 키는 유지하고 값만 ***로 대체"""
+    if match.group(1):
+        return match.group(1) + '"***"'
+    return match.group(2) + '***'
+
+
 def mask_sensitive_info(record):
     """
     로그 메시지에서 민감정보 마스킹
     password, passwd, pwd, token, api_key 등의 값을 ***로 대체
+    (logger patcher로 등록되어 sink 개수와 무관하게 레코드당 한 번 실행)
     """
     message = record["message"]
 
-    # 민감한 키워드 패턴
-    sensitive_patterns = [
-        (r'("password"\s*:\s*)"[^"]*"', r'\1"***"'),  # JSON: "password": "value"
-        (r'("passwd"\s*:\s*)"[^"]*"', r'\1"***"'),
-        (r'("pwd"\s*:\s*)"[^"]*"', r'\1"***"'),
-        (r'("token"\s*:\s*)"[^"]*"', r'\1"***"'),
-        (r'("api_key"\s*:\s*)"[^"]*"', r'\1"***"'),
-        (r'("secret"\s*:\s*)"[^"]*"', r'\1"***"'),
-        (r'(password=)[^&\s]*', r'\1***'),  # URL query: password=value
-        (r'(passwd=)[^&\s]*', r'\1***'),
-        (r'(pwd=)[^&\s]*', r'\1***'),
-        (r'(token=)[^&\s]*', r'\1***'),
-    ]
-
-    for pattern, replacement in sensitive_patterns:
-        message = re.sub(pattern, replacement, message, flags=re.IGNORECASE)
-
-    record["message"] = message
+    # 대부분의 로그에는 민감정보가 없으므로 부분 문자열 검사로 먼저 걸러냄
+    message_lower = message.lower()
+    if not any(trigger in message_lower for trigger in _TRIGGERS):
+        return True
+
+    record["message"] = _MASK_RE.sub(_mask_repl, message)
     return True
 
 
@@ -42,6 +52,9 @@ def setup_logger(log_level: str = "INFO"):
     # 기존 핸들러 제거
     logger.remove()
 
+    # 민감정보 마스킹은 sink별 필터 대신 레코드당 한 번만 적용
+    logger.configure(patcher=mask_sensitive_info)
+
     # 콘솔 핸들러 추가
     logger.add(
         sys.stdout,
@@ -50,7 +63,6 @@ def setup_logger(log_level: str = "INFO"):
                "<level>{level: <8}</level> | "
                "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
                "<level>{message}</level>",
-        filter=mask_sensitive_info,
         colorize=True
     )
 
@@ -65,7 +77,6 @@ def setup_logger(log_level: str = "INFO"):
         retention="30 days",  # 30일간 보관
         level="INFO",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        filter=mask_sensitive_info,
         encoding="utf-8"
     )
 
@@ -76,7 +87,6 @@ def setup_logger(log_level: str = "INFO"):
         retention="30 days",
         level="ERROR",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        filter=mask_sensitive_info,
         encoding="utf-8"
     )
 
@@ -84,5 +94,8 @@ def setup_logger(log_level: str = "INFO"):
     return logger
 
 
-# 기본 로거 인스턴스 (나중에 config.py에서 설정된 레벨로 재초기화 가능)
-log = setup_logger()
+# 기본 로거 인스턴스
+# sink 설정은 애플리케이션 시작 시(lifespan) setup_logger()에서 한 번만 수행하고,
+# 그 전까지는 loguru 기본 stderr 핸들러를 사용 (마스킹은 import 시점부터 적용)
+logger.configure(patcher=mask_sensitive_info)
+log = logger
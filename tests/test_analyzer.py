@@ -1,6 +1,13 @@
+import asyncio
 import pytest
-from app.analyzer.domain_analyzer import DomainAnalyzer
+from urllib.parse import urlparse
+from cachetools import TTLCache
+from app.analyzer.domain_analyzer import DomainAnalyzer, _analyze_cached, _fast_hostname
 from app.analyzer.blacklist import BlacklistManager
+from app.analyzer.domain_trie import DomainTrie
+from app.analyzer.external_api import ExternalAPIBase, ExternalAPIManager
+from app.config import settings
+from app.models.analysis_result import RiskLevel, ExternalAPIResult
 
 
 class TestDomainAnalyzer:
@@ -53,6 +60,11 @@ class TestDomainAnalyzer:
         result = DomainAnalyzer.analyze("not-a-valid-url")
         assert result['is_valid_url'] is False
 
+    def test_trailing_newline_is_invalid(self):
+        """끝에 개행이 붙은 URL은 유효하지 않은 URL로 판단"""
+        result = DomainAnalyzer.analyze("http://phishing-example.com\n")
+        assert result['is_valid_url'] is False
+
     def test_extract_domain_static_method(self):
         """extract_domain 정적 메서드"""
         assert DomainAnalyzer.extract_domain("https://www.example.com/path") == "example.com"
@@ -64,11 +76,69 @@ class TestDomainAnalyzer:
         # IPv6는 콜론 포함으로 감지
         assert result['is_ip_address'] is True
 
+    def test_invalid_ipv4_octet_not_ip(self):
+        """범위를 벗어난 옥텟은 IP 주소로 보지 않음"""
+        result = DomainAnalyzer.analyze("http://999.1.1.1/login")
+        assert result['is_ip_address'] is False
+
+    @pytest.mark.parametrize("host", [
+        "192.168.001.001",  # 0 채움 (8진수)
+        "2130706433",  # 정수 (127.0.0.1)
+        "0x7f000001",  # 16진수 정수
+        "0x7f.0.0.1",  # 16진수 옥텟
+    ])
+    def test_obfuscated_ipv4_is_ip(self, host):
+        """브라우저가 IPv4로 해석하는 비표준 표기도 IP 주소로 판단"""
+        result = DomainAnalyzer.analyze(f"http://{host}/login")
+        assert result['is_valid_url'] is True
+        assert result['is_ip_address'] is True
+
+    def test_cached_result_is_independent_copy(self):
+        """캐시된 결과를 수정해도 다음 분석 결과에 영향 없음"""
+        first = DomainAnalyzer.analyze("https://cache-test.example.com/login")
+        first['domain'] = 'tampered'
+        second = DomainAnalyzer.analyze("https://cache-test.example.com/login")
+        assert second['domain'] == 'example.com'
+
+    def test_readonly_analysis_matches_analyze(self):
+        """읽기 전용 결과는 analyze()와 같고 수정할 수 없음"""
+        url = "https://readonly.example.com/login"
+        readonly = DomainAnalyzer.analyze_readonly(url)
+        assert dict(readonly) == DomainAnalyzer.analyze(url)
+        with pytest.raises(TypeError):
+            readonly['domain'] = 'tampered'
+
+    @pytest.mark.parametrize("url", [
+        "https://www.Example.com/login",
+        "http://user:pw@example.com:8080/path",
+        "https://a@b@example.com",
+        "https://example.com?next=/login",
+        "https://example.com#/login",
+        "HTTPS://EXAMPLE.COM:443",
+        "http://192.168.1.1/login",
+        "http://example.com\n",
+    ])
+    def test_fast_hostname_matches_urlparse(self, url):
+        """빠른 호스트명 추출은 urlparse와 같은 결과"""
+        assert _fast_hostname(url) == (urlparse(url).hostname or '')
+
+    def test_fast_hostname_defers_bracketed_hosts(self):
+        """대괄호 호스트는 urlparse로 위임"""
+        assert _fast_hostname("http://[2001:db8::1]/login") is None
+
     def test_consecutive_hyphens(self):
         """연속된 하이픈 패턴"""
         result = DomainAnalyzer.analyze("https://suspicious--site.com/login")
         assert result['has_suspicious_pattern'] is True
 
+    def test_long_url_not_cached(self):
+        """길이 상한을 넘는 URL은 분석만 하고 캐시하지 않음"""
+        url = "https://example.com/login?q=" + "a" * 4096
+        size = _analyze_cached.cache_info().currsize
+        assert DomainAnalyzer.analyze_readonly(url)['hostname'] == "example.com"
+        assert DomainAnalyzer.analyze(url)['is_valid_url'] is True
+        assert _analyze_cached.cache_info().currsize == size
+
 
 class TestBlacklistManager:
     """BlacklistManager 테스트"""
@@ -90,6 +160,23 @@ class TestBlacklistManager:
         assert temp_blacklist.is_blacklisted("phishing-example.com") is True
         assert temp_blacklist.is_blacklisted("safe-site.com") is False
 
+    def test_subdomain_blacklisted(self, temp_blacklist):
+        """등재된 도메인의 서브도메인도 차단"""
+        assert temp_blacklist.is_blacklisted("login.phishing-example.com") is True
+        assert temp_blacklist.is_blacklisted("a.b.phishing-example.com") is True
+
+    def test_label_boundary_not_blacklisted(self, temp_blacklist):
+        """라벨 경계가 다른 도메인은 차단하지 않음"""
+        assert temp_blacklist.is_blacklisted("notphishing-example.com") is False
+        assert temp_blacklist.is_blacklisted("example.com") is False
+
+    def test_single_label_entry_blacklists_all_subdomains(self, temp_blacklist):
+        """한 라벨짜리 등재 항목(TLD)은 그 아래 모든 도메인을 차단"""
+        temp_blacklist.add("zip")
+        assert temp_blacklist.is_blacklisted("evil.zip") is True
+        assert temp_blacklist.is_blacklisted("login.evil.zip") is True
+        assert temp_blacklist.is_blacklisted("safe-site.com") is False
+
     def test_add_to_blacklist(self, temp_blacklist):
         """블랙리스트에 도메인 추가"""
         test_domain = "new-phishing-site.com"
@@ -130,3 +217,252 @@ class TestBlacklistManager:
 
         temp_blacklist.reload()
         assert temp_blacklist.get_count() == initial_count + 1  # 저장되었으므로 유지
+
+    def test_bulk_update_saves_once(self, temp_blacklist, monkeypatch):
+        """bulk_update 블록 안의 변경은 종료 시 한 번만 저장"""
+        saves = []
+        original_save = temp_blacklist._save_blacklist
+        monkeypatch.setattr(
+            temp_blacklist, "_save_blacklist", lambda: saves.append(1) or original_save()
+        )
+
+        with temp_blacklist.bulk_update():
+            temp_blacklist.add("bulk-1.com")
+            temp_blacklist.add("bulk-2.com")
+            temp_blacklist.remove("fake-login.net")
+            assert saves == []
+
+        assert len(saves) == 1
+        temp_blacklist.reload()
+        assert temp_blacklist.is_blacklisted("bulk-2.com") is True
+        assert temp_blacklist.is_blacklisted("fake-login.net") is False
+
+    def test_entries_normalized_on_load(self, tmp_path):
+        """로드 시 공백 제거와 소문자 변환을 한 번만 수행"""
+        blacklist_file = tmp_path / "messy_blacklist.json"
+        blacklist_file.write_text(
+            '{"domains": ["  Phish.COM ", "", "ok.net"], "description": "feed"}',
+            encoding="utf-8"
+        )
+
+        manager = BlacklistManager(str(blacklist_file))
+        assert manager.get_all() == {"phish.com", "ok.net"}
+        assert manager.is_blacklisted("login.phish.com") is True
+        assert manager.add(" PHISH.com") is False
+
+    def test_streaming_load_large_file(self, tmp_path, monkeypatch):
+        """대용량 파일은 스트리밍으로 파싱해도 같은 결과"""
+        pytest.importorskip("ijson")
+        blacklist_file = tmp_path / "large_blacklist.json"
+        blacklist_file.write_text(
+            '{"domains": ["Big-Phish.com", "other.net"], "description": "feed"}',
+            encoding="utf-8"
+        )
+        monkeypatch.setattr(BlacklistManager, "STREAMING_THRESHOLD_BYTES", 0)
+
+        manager = BlacklistManager(str(blacklist_file))
+        assert manager.get_all() == {"big-phish.com", "other.net"}
+        assert manager.description == "feed"
+        assert manager.is_blacklisted("login.big-phish.com") is True
+
+    def test_instances_share_cached_blacklist(self, tmp_path):
+        """같은 파일의 인스턴스는 파싱 결과를 공유하고, 수정 시 복사"""
+        blacklist_file = str(tmp_path / "shared_blacklist.json")
+        first = BlacklistManager(blacklist_file)
+        second = BlacklistManager(blacklist_file)
+        assert second.blacklist is first.blacklist
+        assert second._trie is first._trie
+
+        first.add("sub.shared-new.com")
+        assert "sub.shared-new.com" not in second.get_all()
+        assert second.is_blacklisted("a.sub.shared-new.com") is False
+        assert first.is_blacklisted("a.sub.shared-new.com") is True
+
+        first.add("shared-new.com")
+        assert BlacklistManager(blacklist_file).is_blacklisted("shared-new.com") is True
+
+    def test_save_keeps_ownership_until_shared(self, tmp_path):
+        """저장 후에도 다른 인스턴스가 가져가기 전까지는 집합을 복사하지 않음"""
+        blacklist_file = str(tmp_path / "owned_blacklist.json")
+        manager = BlacklistManager(blacklist_file)
+        manager.add("first-new.com")
+        owned = manager.blacklist
+        manager.add("second-new.com")
+        assert manager.blacklist is owned
+
+        reader = BlacklistManager(blacklist_file)
+        assert reader.blacklist is owned
+        manager.add("third-new.com")
+        assert manager.blacklist is not owned
+        assert "third-new.com" not in reader.get_all()
+
+
+class TestDomainTrie:
+    """DomainTrie 테스트"""
+
+    def test_matches_domain_and_subdomains(self):
+        """등재 도메인 자신과 서브도메인 일치"""
+        trie = DomainTrie()
+        trie.insert("phishing.com")
+        assert trie.contains_suffix(["phishing", "com"])
+        assert trie.contains_suffix(["login", "secure", "phishing", "com"])
+        assert not trie.contains_suffix(["com"])
+
+    def test_matches_on_label_boundaries_only(self):
+        """라벨 경계가 아닌 부분 문자열은 불일치"""
+        trie = DomainTrie()
+        trie.insert("le.com")
+        assert not trie.contains_suffix(["google", "com"])
+        assert trie.contains_suffix(["www", "le", "com"])
+
+    def test_remove_keeps_other_entries(self):
+        """삭제는 해당 도메인만 제거하고 상위/하위 등재 도메인은 유지"""
+        trie = DomainTrie()
+        trie.insert("phishing.com")
+        trie.insert("login.phishing.com")
+        trie.insert("other.com")
+
+        assert trie.remove("phishing.com") is True
+        assert not trie.contains_suffix(["www", "phishing", "com"])
+        assert trie.contains_suffix(["a", "login", "phishing", "com"])
+        assert trie.contains_suffix(["other", "com"])
+        assert trie.remove("phishing.com") is False
+
+        assert trie.remove("login.phishing.com") is True
+        assert trie.remove("other.com") is True
+        assert trie._root == {}
+
+
+class FakeAPI(ExternalAPIBase):
+    """지연 시간과 결과를 지정할 수 있는 테스트용 외부 API"""
+
+    def __init__(self, name, risk_level=RiskLevel.LOW, delay=0.0, error=None, error_result=None):
+        super().__init__()
+        self.api_name = name
+        self.risk_level = risk_level
+        self.delay = delay
+        self.error = error
+        self.error_result = error_result
+        self.calls = 0
+        self.cancelled = False
+
+    async def check_url(self, url):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        if self.error_result is not None:
+            return self._create_error_result(self.error_result)
+        return ExternalAPIResult(
+            api_name=self.api_name,
+            is_threat=self.risk_level is not RiskLevel.LOW,
+            risk_level=self.risk_level,
+            details={},
+            response_time_ms=self.delay * 1000
+        )
+
+
+class TestExternalAPIBase:
+    """ExternalAPIBase 결과 캐시 테스트"""
+
+    async def test_cache_hit_skips_request(self):
+        """TTL 안의 재조회는 요청 없이 응답 시간 0ms로 반환"""
+        api = FakeAPI("Cached", RiskLevel.MEDIUM, delay=0.01)
+        first = await api.check_url_cached("https://example.com")
+        second = await api.check_url_cached("https://example.com")
+
+        assert api.calls == 1
+        assert first.response_time_ms > 0
+        assert second.response_time_ms == 0
+        assert second.risk_level is RiskLevel.MEDIUM
+
+    async def test_error_result_not_cached(self):
+        """에러 결과는 캐시하지 않고 다음 조회에서 다시 요청"""
+        api = FakeAPI("Flaky", error_result="timeout")
+        result = await api.check_url_cached("https://example.com")
+        await api.check_url_cached("https://example.com")
+
+        assert result.details["error"] == "timeout"
+        assert api.calls == 2
+
+    async def test_cache_expires_after_ttl(self):
+        """TTL이 지나면 다시 요청"""
+        now = [0.0]
+        api = FakeAPI("Expiring")
+        api._cache = TTLCache(maxsize=10, ttl=api.CACHE_TTL_SECONDS, timer=lambda: now[0])
+
+        await api.check_url_cached("https://example.com")
+        now[0] += api.CACHE_TTL_SECONDS + 1
+        await api.check_url_cached("https://example.com")
+
+        assert api.calls == 2
+
+    async def test_long_url_not_cached(self):
+        """길이 상한을 넘는 URL은 캐시하지 않음"""
+        api = FakeAPI("Long")
+        url = "https://example.com/?q=" + "a" * settings.max_cached_url_length
+        await api.check_url_cached(url)
+        await api.check_url_cached(url)
+
+        assert api.calls == 2
+        assert len(api._cache) == 0
+
+
+class TestExternalAPIManager:
+    """ExternalAPIManager 테스트 (가짜 API 사용)"""
+
+    @staticmethod
+    def make_manager(*apis):
+        manager = ExternalAPIManager()
+        manager.apis = list(apis)
+        return manager
+
+    async def test_results_follow_api_order(self):
+        """응답 순서와 관계없이 self.apis 순서로 반환 (동률 시 앞선 API가 결정)"""
+        manager = self.make_manager(
+            FakeAPI("Google", RiskLevel.MEDIUM, delay=0.05),
+            FakeAPI("VT", RiskLevel.MEDIUM, delay=0.01)
+        )
+        results = await manager.check_url_all("https://example.com")
+
+        assert [r.api_name for r in results] == ["Google", "VT"]
+        assert manager.get_highest_risk(results) == (RiskLevel.MEDIUM, "Google")
+
+    async def test_high_risk_cancels_pending(self):
+        """HIGH 결과가 나오면 아직 응답하지 않은 요청은 취소"""
+        slow = FakeAPI("Slow", RiskLevel.LOW, delay=5)
+        manager = self.make_manager(slow, FakeAPI("Fast", RiskLevel.HIGH, delay=0.01))
+
+        results = await asyncio.wait_for(manager.check_url_all("https://example.com"), 1)
+
+        assert [r.api_name for r in results] == ["Fast"]
+        assert slow.cancelled is True
+
+    async def test_exception_is_skipped(self):
+        """예외를 던진 API는 결과에서 제외하고 나머지는 반환"""
+        manager = self.make_manager(
+            FakeAPI("Broken", error=RuntimeError("boom")),
+            FakeAPI("Ok", RiskLevel.MEDIUM)
+        )
+        results = await manager.check_url_all("https://example.com")
+
+        assert [r.api_name for r in results] == ["Ok"]
+
+    async def test_client_recreated_after_aclose(self):
+        """aclose() 이후 호출 시 새 공유 클라이언트를 다시 연결"""
+        api = FakeAPI("Ok")
+        manager = self.make_manager(api)
+        api.client = manager._get_client()
+        closed = api.client
+
+        await manager.aclose()
+        assert closed.is_closed
+        await manager.check_url_all("https://example.com")
+
+        assert api.client is manager._client
+        assert api.client is not closed and not api.client.is_closed
+        await manager.aclose()
@@ -1,4 +1,5 @@
 import pytest
+from app.detector import login_detector
 from app.detector.login_detector import LoginDetector
 from app.models.analysis_request import AnalysisRequest
 from datetime import datetime
@@ -99,3 +100,63 @@ class TestLoginDetector:
             result = LoginDetector.detect(request)
             # auth endpoint + POST = 2개 지표로 항상 True
             assert result is True
+
+    @pytest.mark.parametrize("use_automaton", [True, False])
+    def test_credential_fields_with_and_without_automaton(self, monkeypatch, use_automaton):
+        """Aho-Corasick 오토마톤과 정규식 폴백이 같은 결과"""
+        if use_automaton:
+            pytest.importorskip("ahocorasick")
+        else:
+            monkeypatch.setattr(login_detector, "_CREDENTIAL_AC", None)
+            monkeypatch.setattr(login_detector, "_AUTH_ENDPOINT_AC", None)
+        login_detector._url_has_auth_keyword.cache_clear()
+
+        test_cases = [
+            ({"username": "user", "password": "pass"}, True),
+            ({"Email": "user@test.com", "PWD": "pass"}, True),
+            ({"password": "pass"}, False),  # 사용자 식별 필드 없음
+            ({"form": {"user_email": "a@b.com", "user_pwd": "x"}}, True),  # 중첩/부분 일치
+            ({"name": "test", "data": "value"}, False),
+        ]
+        for body, expected in test_cases:
+            request = AnalysisRequest(
+                url="https://example.com/OAuth/token",
+                method="POST",
+                headers={},
+                body=body,
+                timestamp=datetime.now()
+            )
+            assert LoginDetector._has_credential_fields(request) is expected
+            assert LoginDetector._is_auth_endpoint(request) is True
+
+    def test_long_url_auth_check_not_cached(self):
+        """길이 상한을 넘는 URL은 인증 엔드포인트 검사 결과를 캐시하지 않음"""
+        login_detector._url_has_auth_keyword.cache_clear()
+        request = AnalysisRequest(
+            url="https://example.com/login?next=" + "a" * 4096,
+            method="POST",
+            headers={},
+            body=None,
+            timestamp=datetime.now()
+        )
+        assert LoginDetector._is_auth_endpoint(request) is True
+        assert login_detector._url_has_auth_keyword.cache_info().currsize == 0
+
+    def test_derived_fields_keep_requests_equal(self):
+        """파생 값을 사용한 뒤에도 같은 내용의 요청은 동일하게 비교"""
+        timestamp = datetime.now()
+        first, second = (
+            AnalysisRequest(
+                url="https://example.com/login",
+                method="post",
+                headers={"Authorization": "Bearer x"},
+                body={"username": "user", "password": "pass"},
+                timestamp=timestamp
+            )
+            for _ in range(2)
+        )
+        assert first == second
+        assert first.header_keys_lower == frozenset({"authorization"})
+        assert first.method_upper == "POST"
+        assert LoginDetector.detect(first) is True
+        assert first == second
@@ -1,194 +1,269 @@
+import threading
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
+from app.detector import login_detector
 from app.main import app
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(scope="class")
 class TestIntegration:
     """통합 테스트 - 전체 파이프라인"""
 
-    async def test_health_check(self):
-        """헬스 체크"""
+    @pytest_asyncio.fixture(scope="class")
+    async def api_client(self):
+        """클래스 전체에서 공유하는 ASGI 클라이언트"""
         async with AsyncClient(app=app, base_url="http://test") as client:
-            response = await client.get("/health")
+            yield client
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data['status'] == 'healthy'
-            assert 'version' in data
-            assert 'blacklist_count' in data
+    async def test_health_check(self, api_client):
+        """헬스 체크"""
+        response = await api_client.get("/health")
 
-    async def test_root_endpoint(self):
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == 'healthy'
+        assert 'version' in data
+        assert 'blacklist_count' in data
+
+    async def test_root_endpoint(self, api_client):
         """루트 엔드포인트"""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            response = await client.get("/")
+        response = await api_client.get("/")
 
-            assert response.status_code == 200
-            assert 'text/html' in response.headers['content-type']
-            assert 'Credential Phishing Detection System' in response.text
+        assert response.status_code == 200
+        assert 'text/html' in response.headers['content-type']
+        assert 'Credential Phishing Detection System' in response.text
 
-    async def test_analyze_ip_address_phishing(self):
+    async def test_analyze_ip_address_phishing(self, api_client):
         """IP 주소 사용 피싱 사이트 전체 플로우"""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            request_data = {
-                "url": "http://192.168.1.1/login",
-                "method": "POST",
-                "headers": {},
-                "body": {"username": "test", "password": "pass123"}
-            }
+        request_data = {
+            "url": "http://192.168.1.1/login",
+            "method": "POST",
+            "headers": {},
+            "body": {"username": "test", "password": "pass123"}
+        }
 
-            response = await client.post("/api/v1/analyze", json=request_data)
+        response = await api_client.post("/api/v1/analyze", json=request_data)
 
-            # IP 주소 사용은 고위험이므로 차단 (403) 또는 경고 (200)
-            assert response.status_code in [200, 403]
+        # IP 주소 사용은 고위험이므로 차단 (403) 또는 경고 (200)
+        assert response.status_code in [200, 403]
 
-            if response.status_code == 200:
-                data = response.json()
-                assert data['is_login_attempt'] is True
-                assert data['risk_level'] in ['high', 'medium']
-                assert any('IP 주소' in reason for reason in data['reasons'])
-            else:  # 403 차단
-                assert 'text/html' in response.headers['content-type']
-                assert '위험한 사이트' in response.text
-
-    async def test_analyze_normal_site(self):
-        """정상 사이트 허용"""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            request_data = {
-                "url": "https://www.google.com/login",
-                "method": "POST",
-                "headers": {},
-                "body": {"username": "test", "password": "pass"}
-            }
-
-            response = await client.post("/api/v1/analyze", json=request_data)
-
-            assert response.status_code == 200
+        if response.status_code == 200:
             data = response.json()
             assert data['is_login_attempt'] is True
-            # Google은 정상 사이트이므로 저위험일 가능성 높음
-            # 단, 외부 API 설정에 따라 다를 수 있음
+            assert data['risk_level'] in ['high', 'medium']
+            assert any('IP 주소' in reason for reason in data['reasons'])
+        else:  # 403 차단
+            assert 'text/html' in response.headers['content-type']
+            assert '위험한 사이트' in response.text
 
-    async def test_analyze_non_login_request(self):
+    async def test_analyze_normal_site(self, api_client):
+        """정상 사이트 허용"""
+        request_data = {
+            "url": "https://www.google.com/login",
+            "method": "POST",
+            "headers": {},
+            "body": {"username": "test", "password": "pass"}
+        }
+
+        response = await api_client.post("/api/v1/analyze", json=request_data)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['is_login_attempt'] is True
+        # Google은 정상 사이트이므로 저위험일 가능성 높음
+        # 단, 외부 API 설정에 따라 다를 수 있음
+
+    async def test_analyze_non_login_request(self, api_client):
         """로그인이 아닌 요청은 통과"""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            request_data = {
-                "url": "https://example.com/api/data",
-                "method": "POST",
-                "headers": {},
-                "body": {"data": "test"}
-            }
+        request_data = {
+            "url": "https://example.com/api/data",
+            "method": "POST",
+            "headers": {},
+            "body": {"data": "test"}
+        }
 
-            response = await client.post("/api/v1/analyze", json=request_data)
+        response = await api_client.post("/api/v1/analyze", json=request_data)
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data['is_login_attempt'] is False
-            assert data['action'] == 'allowed'
+        assert response.status_code == 200
+        data = response.json()
+        assert data['is_login_attempt'] is False
+        assert data['action'] == 'allowed'
 
-    async def test_analyze_blacklisted_domain(self):
+    async def test_analyze_blacklisted_domain(self, api_client):
         """블랙리스트 도메인 차단"""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            request_data = {
-                "url": "http://phishing-example.com/login",
-                "method": "POST",
-                "headers": {},
-                "body": {"username": "test", "password": "pass"}
-            }
+        request_data = {
+            "url": "http://phishing-example.com/login",
+            "method": "POST",
+            "headers": {},
+            "body": {"username": "test", "password": "pass"}
+        }
 
-            response = await client.post("/api/v1/analyze", json=request_data)
+        response = await api_client.post("/api/v1/analyze", json=request_data)
 
-            # 블랙리스트 도메인은 고위험
-            assert response.status_code in [200, 403]
+        # 블랙리스트 도메인은 고위험
+        assert response.status_code in [200, 403]
 
-            if response.status_code == 200:
-                data = response.json()
-                assert data['is_login_attempt'] is True
-                assert data['risk_level'] in ['high', 'medium']
-                assert any('블랙리스트' in reason for reason in data['reasons'])
-            else:
-                # 차단 페이지
-                assert '위험한 사이트' in response.text
+        if response.status_code == 200:
+            data = response.json()
+            assert data['is_login_attempt'] is True
+            assert data['risk_level'] in ['high', 'medium']
+            assert any('블랙리스트' in reason for reason in data['reasons'])
+        else:
+            # 차단 페이지
+            assert '위험한 사이트' in response.text
 
-    async def test_analyze_suspicious_pattern(self):
+    async def test_analyze_suspicious_pattern(self, api_client):
         """의심스러운 URL 패턴 감지"""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            request_data = {
-                "url": "http://user@fake-site.com/login",
-                "method": "POST",
-                "headers": {},
-                "body": {"username": "test", "password": "pass"}
-            }
+        request_data = {
+            "url": "http://user@fake-site.com/login",
+            "method": "POST",
+            "headers": {},
+            "body": {"username": "test", "password": "pass"}
+        }
 
-            response = await client.post("/api/v1/analyze", json=request_data)
+        response = await api_client.post("/api/v1/analyze", json=request_data)
 
-            assert response.status_code in [200, 403]
+        assert response.status_code in [200, 403]
 
-            if response.status_code == 200:
-                data = response.json()
-                assert data['is_login_attempt'] is True
-                # 의심스러운 패턴으로 점수 증가
+        if response.status_code == 200:
+            data = response.json()
+            assert data['is_login_attempt'] is True
+            # 의심스러운 패턴으로 점수 증가
 
-    async def test_analyze_with_auth_endpoint(self):
+    async def test_analyze_with_auth_endpoint(self, api_client):
         """인증 엔드포인트 감지"""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            request_data = {
-                "url": "https://example.com/oauth/token",
-                "method": "POST",
-                "headers": {},
-                "body": {"grant_type": "password", "username": "user", "password": "pass"}
-            }
+        request_data = {
+            "url": "https://example.com/oauth/token",
+            "method": "POST",
+            "headers": {},
+            "body": {"grant_type": "password", "username": "user", "password": "pass"}
+        }
 
-            response = await client.post("/api/v1/analyze", json=request_data)
+        response = await api_client.post("/api/v1/analyze", json=request_data)
 
-            assert response.status_code in [200, 403]
-            # OAuth 엔드포인트는 로그인 시도로 감지됨
+        assert response.status_code in [200, 403]
+        # OAuth 엔드포인트는 로그인 시도로 감지됨
 
-    async def test_warning_page_content(self):
+    async def test_warning_page_content(self, api_client):
         """경고 페이지 콘텐츠 확인"""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            request_data = {
-                "url": "http://192.168.1.1/login",
-                "method": "POST",
-                "headers": {},
-                "body": {"username": "test", "password": "pass"}
-            }
-
-            response = await client.post("/api/v1/analyze", json=request_data)
-
-            if response.status_code == 403:
-                html = response.text
-                assert '⚠️' in html or '위험' in html
-                assert '차단' in html
-                assert '192.168.1.1' in html
-                assert 'IP 주소' in html
-
-    async def test_multiple_requests_in_sequence(self):
+        request_data = {
+            "url": "http://192.168.1.1/login",
+            "method": "POST",
+            "headers": {},
+            "body": {"username": "test", "password": "pass"}
+        }
+
+        response = await api_client.post("/api/v1/analyze", json=request_data)
+
+        if response.status_code == 403:
+            html = response.text
+            assert '⚠️' in html or '위험' in html
+            assert '차단' in html
+            assert '192.168.1.1' in html
+            assert 'IP 주소' in html
+
+    async def test_multiple_requests_in_sequence(self, api_client):
         """연속된 여러 요청 처리"""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            # 정상 요청
-            response1 = await client.post("/api/v1/analyze", json={
-                "url": "https://www.example.com/api",
-                "method": "GET",
-                "headers": {},
-                "body": None
-            })
-            assert response1.status_code == 200
-
-            # 로그인 요청 (정상 사이트)
-            response2 = await client.post("/api/v1/analyze", json={
-                "url": "https://www.example.com/login",
+        # 정상 요청
+        response1 = await api_client.post("/api/v1/analyze", json={
+            "url": "https://www.example.com/api",
+            "method": "GET",
+            "headers": {},
+            "body": None
+        })
+        assert response1.status_code == 200
+
+        # 로그인 요청 (정상 사이트)
+        response2 = await api_client.post("/api/v1/analyze", json={
+            "url": "https://www.example.com/login",
+            "method": "POST",
+            "headers": {},
+            "body": {"username": "test", "password": "pass"}
+        })
+        assert response2.status_code in [200, 403]
+
+        # IP 주소 로그인 (위험)
+        response3 = await api_client.post("/api/v1/analyze", json={
+            "url": "http://10.0.0.1/login",
+            "method": "POST",
+            "headers": {},
+            "body": {"username": "test", "password": "pass"}
+        })
+        assert response3.status_code in [200, 403]
+
+    async def test_analyze_batch(self, api_client):
+        """일괄 분석은 요청 순서대로 결과 반환"""
+        response = await api_client.post("/api/v1/analyze/batch", json=[
+            {
+                "url": "https://example.com/api/data",
                 "method": "POST",
                 "headers": {},
-                "body": {"username": "test", "password": "pass"}
-            })
-            assert response2.status_code in [200, 403]
-
-            # IP 주소 로그인 (위험)
-            response3 = await client.post("/api/v1/analyze", json={
-                "url": "http://10.0.0.1/login",
+                "body": {"data": "test"}
+            },
+            {
+                "url": "http://192.168.1.1/login",
                 "method": "POST",
                 "headers": {},
                 "body": {"username": "test", "password": "pass"}
-            })
-            assert response3.status_code in [200, 403]
+            }
+        ])
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 2
+        assert data[0]['is_login_attempt'] is False
+        assert data[1]['is_login_attempt'] is True
+        assert any('IP 주소' in reason for reason in data[1]['reasons'])
+
+    async def test_analyze_batch_too_large(self, api_client):
+        """최대 개수를 넘는 일괄 요청은 항목 검증 전에 거부"""
+        response = await api_client.post("/api/v1/analyze/batch", json=[{}] * 101)
+
+        assert response.status_code == 422
+        errors = response.json()['detail']
+        assert [error['type'] for error in errors] == ['too_long']
+
+    async def test_analyze_batch_isolates_failed_item(self, api_client, monkeypatch):
+        """오류가 난 항목만 error로 반환하고 나머지 결과는 유지"""
+        original_detect = login_detector.detect
+
+        def failing_detect(request):
+            if "broken" in request.url:
+                raise RuntimeError("boom")
+            return original_detect(request)
+
+        monkeypatch.setattr(login_detector, "detect", failing_detect)
+        item = {"method": "POST", "headers": {}, "body": {"data": "test"}}
+        response = await api_client.post("/api/v1/analyze/batch", json=[
+            {**item, "url": "https://example.com/api/data"},
+            {**item, "url": "https://broken.example.com/api/data"},
+        ])
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0]['is_login_attempt'] is False
+        assert data[1] == {"error": "Internal server error"}
+
+    async def test_large_body_detected_off_event_loop(self, api_client, monkeypatch):
+        """본문이 큰 요청은 필드 수와 무관하게 스레드풀에서 로그인 감지"""
+        threads = []
+        original_detect = login_detector.detect
+
+        def recording_detect(request):
+            threads.append(threading.current_thread())
+            return original_detect(request)
+
+        monkeypatch.setattr(login_detector, "detect", recording_detect)
+        payload = {"url": "https://example.com/page", "method": "POST", "headers": {}}
+
+        await api_client.post("/api/v1/analyze", json={**payload, "body": {"data": "x"}})
+        response = await api_client.post(
+            "/api/v1/analyze",
+            json={**payload, "body": {"data": "x" * 100_000, "username": "u", "pwd": "p"}}
+        )
+
+        assert response.status_code == 200
+        assert response.json()['is_login_attempt'] is True
+        assert threads[0] is threading.main_thread()
+        assert threads[1] is not threading.main_thread()
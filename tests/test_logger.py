@@ -0,0 +1,80 @@
+import io
+import sys
+import pytest
+from loguru import logger
+from app.utils import logger as logger_module
+from app.utils.logger import mask_sensitive_info, setup_logger
+
+
+def mask(message: str) -> str:
+    """레코드 하나를 마스킹한 결과 메시지"""
+    record = {"message": message}
+    assert mask_sensitive_info(record) is True
+    return record["message"]
+
+
+class TestMaskSensitiveInfo:
+    """민감정보 마스킹 테스트"""
+
+    def test_mask_json_form(self):
+        """JSON 형식은 키를 유지하고 값만 마스킹"""
+        masked = mask('body={"username": "kim", "password": "hunter2", "api_key":"abc"}')
+        assert masked == 'body={"username": "kim", "password": "***", "api_key":"***"}'
+
+    def test_mask_query_form(self):
+        """URL 쿼리 형식은 다음 구분자 전까지 마스킹"""
+        masked = mask("GET /login?user=kim&pwd=hunter2&token=xyz next")
+        assert masked == "GET /login?user=kim&pwd=***&token=*** next"
+
+    def test_mask_mixed_case(self):
+        """키 대소문자와 무관하게 마스킹 (원래 키 표기는 유지)"""
+        masked = mask('{"Password": "hunter2"} PASSWD=secret1')
+        assert masked == '{"Password": "***"} PASSWD=***'
+
+    def test_no_trigger_short_circuit(self, monkeypatch):
+        """민감 키워드가 없으면 정규식을 실행하지 않음"""
+        class FailingPattern:
+            def sub(self, *args):
+                raise AssertionError("정규식이 실행되면 안 됨")
+
+        monkeypatch.setattr(logger_module, "_MASK_RE", FailingPattern())
+        message = "GET /api/data?page=2"
+        assert mask(message) == message
+
+
+class TestSetupLogger:
+    """setup_logger 테스트"""
+
+    @pytest.fixture
+    def configured_logs(self, tmp_path, monkeypatch):
+        """임시 디렉토리와 버퍼에 sink를 설정하고, 종료 후 기본 설정으로 복원"""
+        calls = []
+        stdout = io.StringIO()
+
+        def counting_mask(record):
+            calls.append(record["message"])
+            return mask_sensitive_info(record)
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(sys, "stdout", stdout)
+        monkeypatch.setattr(logger_module, "mask_sensitive_info", counting_mask)
+        setup_logger("INFO")
+        yield stdout, tmp_path / "logs", calls
+
+        logger.remove()
+        logger.add(sys.stderr)
+        logger.configure(patcher=mask_sensitive_info)
+
+    def test_masks_once_for_all_sinks(self, configured_logs):
+        """patcher가 레코드당 한 번 마스킹하여 세 sink 모두에 반영"""
+        stdout, log_dir, calls = configured_logs
+        logger.error("login failed password=hunter2")
+        logger.complete()
+
+        assert calls.count("login failed password=hunter2") == 1
+        outputs = [stdout.getvalue()]
+        outputs += [path.read_text(encoding="utf-8") for path in sorted(log_dir.glob("*.log"))]
+        assert len(outputs) == 3
+        for output in outputs:
+            assert "password=***" in output
+            assert "hunter2" not in output
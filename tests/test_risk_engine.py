@@ -1,6 +1,7 @@
 import pytest
 from app.risk_engine.risk_calculator import RiskCalculator
 from app.models.analysis_result import RiskLevel, Action, ExternalAPIResult
+from app.models.internal_analysis import InternalAnalysis
 
 
 class TestRiskCalculator:
@@ -95,6 +96,17 @@ class TestRiskCalculator:
         score = RiskCalculator.calculate_score_only(high_analysis)
         assert score == 90
 
+    def test_internal_analysis_dataclass(self, sample_internal_analysis):
+        """InternalAnalysis 입력은 dict 입력과 같은 결과"""
+        analysis = sample_internal_analysis.copy()
+        analysis['in_blacklist'] = True
+        analysis['subdomain_depth'] = 4
+
+        from_dict = RiskCalculator.calculate(analysis, [])
+        from_dataclass = RiskCalculator.calculate(InternalAnalysis.from_dict(analysis), [])
+        assert from_dataclass.score == from_dict.score
+        assert from_dataclass.reasons == from_dict.reasons
+
     def test_deep_subdomain_scoring(self, sample_internal_analysis):
         """깊은 서브도메인 점수"""
         analysis = sample_internal_analysis.copy()